@@ -0,0 +1,102 @@
+"""Estimate memory per 1k guilds for each cache profile.
+
+Synthetic GUILD_CREATE and MESSAGE_CREATE payloads are fed straight into the
+client's connection state (no gateway connection), then RSS and traced Python
+allocations are measured. Each profile runs in a fresh subprocess.
+
+Run from the repository root: ``python benchmarks/bench_cache_memory.py [guilds] [members] [messages]``
+"""
+import os
+import sys
+import json
+import subprocess
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+PROFILES = ("full", "lean", "minimal")
+
+
+def rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def member_payload():
+    return {"roles": [], "joined_at": "2020-01-01T00:00:00+00:00", "deaf": False, "mute": False, "flags": 0}
+
+
+def guild_payload(guild_id, members, channels=10):
+    return {
+        "id": str(guild_id),
+        "name": f"guild-{guild_id}",
+        "owner_id": "1",
+        "member_count": members,
+        "roles": [{"id": str(guild_id), "name": "@everyone", "permissions": "0", "position": 0, "color": 0,
+                   "hoist": False, "managed": False, "mentionable": False}],
+        "channels": [{"id": str(guild_id * 100 + c), "type": 0, "name": f"chan-{c}", "position": c,
+                      "permission_overwrites": []} for c in range(channels)],
+        "members": [{**member_payload(), "user": {"id": str(guild_id * 10000 + m), "username": f"user{m}",
+                                                   "discriminator": "0", "avatar": None}}
+                    for m in range(members)],
+        "emojis": [], "stickers": [], "features": [], "voice_states": [], "presences": [], "threads": [],
+        "stage_instances": [], "guild_scheduled_events": [],
+    }
+
+
+def message_payload(message_id, guild_id, channel_id, author_id):
+    return {
+        "id": str(message_id), "channel_id": str(channel_id), "guild_id": str(guild_id), "type": 0,
+        "content": "hello there, this is a fairly ordinary chat message", "tts": False,
+        "mention_everyone": False, "mentions": [], "mention_roles": [], "attachments": [], "embeds": [],
+        "pinned": False, "timestamp": "2024-01-01T00:00:00+00:00", "edited_timestamp": None,
+        "author": {"id": str(author_id), "username": "someone", "discriminator": "0", "avatar": None},
+        "member": member_payload(),
+    }
+
+
+def measure(profile, guilds, members, messages):
+    os.environ["CACHE_PROFILE"] = profile
+    from src.bot import Bot
+
+    bot = Bot()
+    state = bot._connection
+    state.dispatch = lambda *args, **kwargs: None
+
+    rss_before = rss_bytes()
+    tracemalloc.start()
+    for g in range(1, guilds + 1):
+        state._add_guild_from_data(guild_payload(g, members))
+    for i in range(messages):
+        g = i % guilds + 1
+        state.parse_message_create(message_payload(10 ** 9 + i, g, g * 100, g * 10000 + i % members))
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    scale = 1000 / guilds
+    return {
+        "profile": profile,
+        "rss_per_1k_guilds_mb": (rss_bytes() - rss_before) * scale / 2 ** 20,
+        "traced_per_1k_guilds_mb": traced * scale / 2 ** 20,
+        "cached_messages": len(state._messages or ()),
+        "cached_members": sum(len(guild._members) for guild in state.guilds),
+    }
+
+
+def main(guilds=1000, members=50, messages=20000):
+    print(f"{guilds} guilds, {members} members each, {messages} messages")
+    print(f"{'profile':<8} {'RSS MB/1k guilds':>17} {'traced MB/1k guilds':>20} {'messages':>9} {'members':>9}")
+    for profile in PROFILES:
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", profile, str(guilds), str(members), str(messages)],
+            check=True, capture_output=True, text=True).stdout
+        r = json.loads(output.strip().splitlines()[-1])
+        print(f"{r['profile']:<8} {r['rss_per_1k_guilds_mb']:>17.1f} {r['traced_per_1k_guilds_mb']:>20.1f} "
+              f"{r['cached_messages']:>9} {r['cached_members']:>9}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        print(json.dumps(measure(sys.argv[2], *map(int, sys.argv[3:6]))))
+    else:
+        main(*map(int, sys.argv[1:4]))
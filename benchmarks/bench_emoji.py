@@ -0,0 +1,42 @@
+"""Compare the old per-call emoji list build in !fireworks with the precomputed table.
+
+Run from the repository root: ``python benchmarks/bench_emoji.py``
+"""
+import os
+import sys
+import random as rd
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.emoji import EMOJI_TABLE, sample_emojis
+
+LEGACY_RANGES = [
+    (0x1F600, 0x1F64F),
+    (0x1F300, 0x1F5FF),
+    (0x1F680, 0x1F6FF),
+    (0x2600, 0x26FF),
+    (0x1F700, 0x1F77F),
+]
+
+
+def legacy_sample(k=20):
+    emoji_list = []
+    for start, end in LEGACY_RANGES:
+        for codepoint in range(start, end + 1):
+            emoji_list.append(chr(codepoint))
+    return rd.sample(emoji_list, min(k, len(emoji_list)))
+
+
+def main(number=2000):
+    legacy = timeit.timeit(legacy_sample, number=number)
+    table = timeit.timeit(lambda: sample_emojis(20), number=number)
+    legacy_size = sum(end - start + 1 for start, end in LEGACY_RANGES)
+
+    print(f"legacy list build + sample: {legacy / number * 1e6:8.1f} us/call ({legacy_size} candidates)")
+    print(f"precomputed table sample:   {table / number * 1e6:8.1f} us/call ({len(EMOJI_TABLE)} candidates)")
+    print(f"speedup: {legacy / table:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,441 @@
+"""Offline load test: drive ``Bot`` and every cog with synthetic gateway traffic.
+
+Nothing leaves the machine. Gateway events are parsed straight into the
+client's connection state, Discord REST calls are answered by a stub with a
+configurable delay, and every upstream API (OpenTDB, Giphy, Spotify, API
+Ninjas, OpenAI, ...) is served by a local aiohttp app with injectable latency
+and error rate. The report covers throughput, p50/p99 command latency,
+event-loop lag and RSS; each run is appended to ``benchmarks/results/loadtest.jsonl``
+and compared with the previous run that used the same parameters.
+
+Run from the repository root: ``python benchmarks/loadtest.py --duration 30 --rate 50``
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import tempfile
+import subprocess
+from urllib.parse import quote, urlsplit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import discord
+from aiohttp import web
+
+RESULTS_PATH = os.path.join(ROOT, "benchmarks", "results", "loadtest.jsonl")
+
+# Command mix: (weight, content). Answers and words keep the chat games busy.
+COMMAND_MIX = [
+    (10, "!joke"), (10, "!gif cats"), (8, "!meme"), (10, "!8ball will it scale?"), (10, "!flip"),
+    (8, "!fact"), (6, "!today"), (6, "!music rock"), (6, "!trivia"), (4, "!riddle"), (3, "!adventure"),
+    (3, "!wordgame"), (3, "!leaderboard"), (3, "!stats"),
+]
+CHATTER = ["1", "2", "3", "4", "hello", "tiger", "rabbit", "tomato", "orange", "elephant"]
+OPTIONS = ["1️⃣", "2️⃣", "3️⃣"]
+
+
+def rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class MockUpstreams:
+    """Local stand-ins for every upstream API, addressed as ``http://127.0.0.1:<port>/<host>/<path>``."""
+
+    def __init__(self, latency=0.05, error_rate=0.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self.port = None
+        self._runner = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    async def start(self):
+        app = web.Application(middlewares=[self._inject_faults])
+        app.router.add_route("*", "/{host}/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+    @web.middleware
+    async def _inject_faults(self, request, handler):
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(random.expovariate(1 / self.latency))
+        if random.random() < self.error_rate:
+            self.errors += 1
+            return web.json_response({"error": "injected"}, status=503)
+        return await handler(request)
+
+    async def _handle(self, request):
+        host, path = request.match_info["host"], "/" + request.match_info["path"]
+        if host == "api.openai.com":
+            return await self._openai(request)
+        body = self._payload(host, path, request)
+        if body is None:
+            return web.json_response({"error": "not found"}, status=404)
+        return web.json_response(body)
+
+    def _payload(self, host, path, request):
+        n = random.randrange(1000)
+        if host == "official-joke-api.appspot.com":
+            return {"setup": f"Why did benchmark {n} cross the road?", "punchline": "To measure the other side."}
+        if host == "api.giphy.com":
+            return {"data": [{"images": {"original": {"url": f"https://gifs.example/{n}-{i}.gif"}}}
+                             for i in range(25)], "pagination": {"total_count": 500}}
+        if host == "meme-api.herokuapp.com":
+            return {"title": f"Meme {n}", "url": f"https://memes.example/{n}.png", "ups": n, "subreddit": "bench"}
+        if host == "uselessfacts.jsph.pl":
+            return {"text": f"Fact number {n}."}
+        if host == "byabbe.se":
+            return {"events": [{"year": str(1900 + i), "description": f"Event {i}"} for i in range(20)]}
+        if host == "opentdb.com" and path == "/api_token.php":
+            return {"response_code": 0, "token": "bench-token"}
+        if host == "opentdb.com":
+            amount = int(request.query.get("amount", 1))
+            return {"response_code": 0, "results": [
+                {"question": quote(f"Question {n}-{i}?"), "correct_answer": "Right",
+                 "incorrect_answers": ["Wrong", "Nope", "Nah"], "category": "Bench", "difficulty": "easy"}
+                for i in range(amount)]}
+        if host == "api.api-ninjas.com" and path.startswith("/v1/riddles"):
+            return [{"question": f"Riddle {n}?", "answer": "benchmark"}]
+        if host == "api.api-ninjas.com":
+            return [{"fact": f"Ninja fact {n}."}]
+        if host == "accounts.spotify.com":
+            return {"access_token": "bench", "expires_in": 3600}
+        if host == "api.spotify.com" and path.endswith("available-genre-seeds"):
+            return {"genres": ["rock", "pop", "jazz"]}
+        if host == "api.spotify.com":
+            return {"tracks": {"items": [
+                {"name": f"Track {i}", "artists": [{"name": "Bench Band"}],
+                 "external_urls": {"spotify": f"https://open.spotify.example/{i}"}, "album": {"images": []}}
+                for i in range(50)]}}
+        return None
+
+    async def _openai(self, request):
+        body = await request.json()
+        if body.get("response_format", {}).get("type") == "json_object":
+            adventures = [{"scenario": f"Scenario {i}", "choices": ["Left", "Right", "Back"],
+                           "outcomes": ["You win.", "You lose.", "You go home."]} for i in range(5)]
+            text = json.dumps({"adventures": adventures})
+        else:
+            text = "A dragon blocks the bridge.\nFight it\nSneak past\nBribe it with gold"
+
+        if not body.get("stream"):
+            return web.json_response({
+                "id": "bench", "object": "chat.completion", "created": int(time.time()), "model": body["model"],
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": text}}]})
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for word in text.split(" "):
+            chunk = {"id": "bench", "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": body["model"],
+                     "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}]}
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            await asyncio.sleep(0.01)
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+
+class RedirectingSession:
+    """Wraps an aiohttp session so absolute upstream URLs are sent to ``MockUpstreams``."""
+
+    def __init__(self, session, base_url):
+        self._session = session
+        self.base_url = base_url
+
+    @property
+    def closed(self):
+        return self._session.closed
+
+    def request(self, method, url, **kwargs):
+        parts = urlsplit(url)
+        target = f"{self.base_url}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+        return self._session.request(method, target, **kwargs)
+
+    async def close(self):
+        await self._session.close()
+
+
+class FakeDiscordHTTP:
+    """Answers the bot's REST calls locally, after ``latency`` seconds, and remembers sent messages."""
+
+    def __init__(self, bot_user, latency=0.03):
+        self.bot_user = bot_user
+        self.latency = latency
+        self.calls = 0
+        self.sent = {}
+        self._ids = iter(range(2 * 10 ** 17, 3 * 10 ** 17))
+
+    async def request(self, route, **kwargs):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(random.expovariate(1 / self.latency))
+        if route.method in ("POST", "PATCH") and "/messages" in route.path and not route.path.endswith("/typing"):
+            payload = kwargs.get("json") or {}
+            message_id = next(self._ids)
+            channel_id = route.channel_id
+            self.sent.setdefault(channel_id, []).append(message_id)
+            del self.sent[channel_id][:-20]
+            return {
+                "id": str(message_id), "channel_id": str(channel_id), "type": 0, "tts": False,
+                "content": payload.get("content") or "", "embeds": payload.get("embeds") or [],
+                "author": self.bot_user, "mention_everyone": False, "mentions": [], "mention_roles": [],
+                "attachments": [], "pinned": False, "timestamp": "2024-01-01T00:00:00+00:00",
+                "edited_timestamp": None,
+            }
+        return None
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.latencies = []
+        self.errors = 0
+        self.started = {}
+        self.lag = []
+        self.sent_commands = 0
+        self.sent_events = 0
+        self._ids = iter(range(10 ** 17, 2 * 10 ** 17))
+        self._authors = {}
+
+    async def run(self):
+        from benchmarks.bench_cache_memory import guild_payload, member_payload
+        from src.bot import Bot
+
+        self.member_payload = member_payload
+        upstreams = MockUpstreams(self.args.upstream_latency, self.args.error_rate)
+        await upstreams.start()
+        os.environ["OPENAI_BASE_URL"] = f"{upstreams.base_url}/api.openai.com/v1"
+
+        bot = Bot()
+        state = bot._connection
+        bot_user = {"id": "1", "username": "botzilla", "discriminator": "0", "avatar": None, "bot": True}
+        state.user = discord.ClientUser(state=state, data=bot_user)
+        http = FakeDiscordHTTP(bot_user, self.args.discord_latency)
+        bot.http.request = http.request
+
+        await bot._async_setup_hook()
+        await bot.setup_hook()
+        bot.api_client._session = RedirectingSession(bot.api_client.session, upstreams.base_url)
+
+        for g in range(1, self.args.guilds + 1):
+            state._add_guild_from_data(guild_payload(g, members=0, channels=self.args.channels))
+        bot._ready.set()
+
+        bot.add_listener(self.on_command, "on_command")
+        bot.add_listener(self.on_command_completion, "on_command_completion")
+        bot.add_listener(self.on_command_error, "on_command_error")
+
+        rss_before = rss_bytes()
+        lag_task = asyncio.create_task(self.monitor_lag())
+        started = time.perf_counter()
+        await asyncio.gather(self.message_stream(state), self.reaction_stream(state, http))
+        elapsed = time.perf_counter() - started
+
+        # Let in-flight commands finish before measuring.
+        deadline = time.perf_counter() + self.args.drain
+        while self.started and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+        lag_task.cancel()
+
+        result = {
+            "duration_s": round(elapsed, 2),
+            "commands_sent": self.sent_commands,
+            "commands_completed": len(self.latencies),
+            "commands_failed": self.errors,
+            "commands_unfinished": len(self.started),
+            "events_sent": self.sent_events,
+            "throughput_cmd_s": round(len(self.latencies) / elapsed, 1),
+            "latency_p50_ms": ms(percentile(self.latencies, 0.5)),
+            "latency_p99_ms": ms(percentile(self.latencies, 0.99)),
+            "loop_lag_p99_ms": ms(percentile(self.lag, 0.99)),
+            "loop_lag_max_ms": ms(max(self.lag, default=None)),
+            "rss_mb": round(rss_bytes() / 2 ** 20, 1),
+            "rss_growth_mb": round((rss_bytes() - rss_before) / 2 ** 20, 1),
+            "upstream_requests": upstreams.requests,
+            "upstream_errors": upstreams.errors,
+            "discord_calls": http.calls,
+        }
+        # Cancel commands still running after the drain so they do not outlive the bot.
+        handlers = [task for task in asyncio.all_tasks() if task.get_name().startswith("discord.py: ")]
+        for task in handlers:
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        await bot.close()
+        await upstreams.stop()
+        return result
+
+    def next_id(self):
+        return next(self._ids)
+
+    async def message_stream(self, state):
+        weights, contents = zip(*COMMAND_MIX)
+        interval = 1 / self.args.rate
+        end = time.perf_counter() + self.args.duration
+        next_at = time.perf_counter()
+        while time.perf_counter() < end:
+            guild_id = random.randint(1, self.args.guilds)
+            channel_id = guild_id * 100 + random.randrange(self.args.channels)
+            user_id = guild_id * 10000 + random.randrange(self.args.users)
+            if random.random() < self.args.chatter:
+                content = random.choice(CHATTER)
+            else:
+                content = random.choices(contents, weights)[0]
+                self.sent_commands += 1
+                self._authors[channel_id] = user_id
+            state.parse_message_create(self.message(guild_id, channel_id, user_id, content))
+            self.sent_events += 1
+
+            # Open loop: keep the schedule even if the bot falls behind.
+            next_at += random.expovariate(1 / interval)
+            await asyncio.sleep(max(0, next_at - time.perf_counter()))
+
+    async def reaction_stream(self, state, http):
+        if not self.args.reaction_rate:
+            return
+        end = time.perf_counter() + self.args.duration
+        while time.perf_counter() < end:
+            await asyncio.sleep(random.expovariate(self.args.reaction_rate))
+            if not http.sent:
+                continue
+            channel_id = random.choice(list(http.sent))
+            guild_id = channel_id // 100
+            state.parse_message_reaction_add({
+                "user_id": str(self._authors.get(channel_id, guild_id * 10000)), "channel_id": str(channel_id),
+                "message_id": str(random.choice(http.sent[channel_id])), "guild_id": str(guild_id),
+                "emoji": {"id": None, "name": random.choice(OPTIONS)}, "type": 0, "burst": False,
+            })
+            self.sent_events += 1
+
+    def message(self, guild_id, channel_id, user_id, content):
+        return {
+            "id": str(self.next_id()), "channel_id": str(channel_id), "guild_id": str(guild_id), "type": 0,
+            "content": content, "tts": False, "mention_everyone": False, "mentions": [], "mention_roles": [],
+            "attachments": [], "embeds": [], "pinned": False, "timestamp": "2024-01-01T00:00:00+00:00",
+            "edited_timestamp": None,
+            "author": {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0", "avatar": None},
+            "member": self.member_payload(),
+        }
+
+    async def monitor_lag(self, interval=0.01):
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.lag.append(max(0.0, time.perf_counter() - before - interval))
+
+    async def on_command(self, ctx):
+        self.started[ctx] = time.perf_counter()
+
+    async def on_command_completion(self, ctx):
+        started = self.started.pop(ctx, None)
+        if started is not None:
+            self.latencies.append(time.perf_counter() - started)
+
+    async def on_command_error(self, ctx, error):
+        if self.started.pop(ctx, None) is not None:
+            self.errors += 1
+
+
+def ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def previous_result(path, params):
+    try:
+        with open(path, encoding="utf-8") as f:
+            runs = [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return None
+    matching = [run for run in runs if run.get("params") == params]
+    return matching[-1] if matching else None
+
+
+def report(result, previous):
+    print(f"{'metric':<22} {'value':>12} {'previous':>12}")
+    for key, value in result.items():
+        before = previous["result"].get(key) if previous else None
+        change = ""
+        if isinstance(value, (int, float)) and isinstance(before, (int, float)) and before:
+            change = f" ({(value - before) / before:+.0%})"
+        print(f"{key:<22} {str(value):>12} {str(before if before is not None else '-'):>12}{change}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline load test for Botzilla")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of traffic")
+    parser.add_argument("--rate", type=float, default=50.0, help="messages per second")
+    parser.add_argument("--reaction-rate", type=float, default=5.0, help="reactions per second")
+    parser.add_argument("--chatter", type=float, default=0.3, help="share of messages that are not commands")
+    parser.add_argument("--guilds", type=int, default=20)
+    parser.add_argument("--channels", type=int, default=5, help="channels per guild")
+    parser.add_argument("--users", type=int, default=50, help="users per guild")
+    parser.add_argument("--upstream-latency", type=float, default=0.05, help="mean upstream latency (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of upstream requests that fail")
+    parser.add_argument("--discord-latency", type=float, default=0.03, help="mean Discord REST latency (s)")
+    parser.add_argument("--drain", type=float, default=10.0, help="seconds to wait for in-flight commands")
+    parser.add_argument("--output", default=RESULTS_PATH, help="JSON lines file to append results to")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args(argv)
+
+    params = {k: v for k, v in vars(args).items() if k not in ("output", "no_save", "drain")}
+
+    # Keep the run isolated from real data and credentials.
+    os.environ.update({
+        "BOTZILLA_DATA_DIR": tempfile.mkdtemp(prefix="botzilla-loadtest-"),
+        "GIPHY_API_KEY": "bench", "API_NINJAS_KEY": "bench", "SPOTIFY_AUTH": "bench",
+    })
+    try:
+        import openai  # noqa: F401
+        os.environ["OPENAI_API_KEY"] = "bench"
+    except ImportError:
+        os.environ.pop("OPENAI_API_KEY", None)
+
+    result = asyncio.run(LoadTest(args).run())
+    logging.disable(logging.NOTSET)
+
+    report(result, previous_result(args.output, params))
+    if not args.no_save:
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "revision": git_revision(),
+                                "python": sys.version.split()[0], "params": params, "result": result}) + "\n")
+        print(f"Saved to {args.output}")
+
+
+if __name__ == '__main__':
+    logging.disable(logging.ERROR)
+    main()
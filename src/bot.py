@@ -1,10 +1,20 @@
 import os
+import json
+import time
+import hashlib
 import asyncio
 import logging
-from pathlib import Path
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
+from src.utils.api_client import ApiClient
+from src.utils.events import EventRouter
+from src.utils.sessions import SessionEngine
+from src.utils.reactions import ReactionDispatcher
+from src.utils.state import create_state_backend
+from src.utils.stats import StatsStore
+from src.utils.storage import data_path, load_json, save_json
+from src.utils.watchdog import LoopWatchdog
 
 
 logging.basicConfig(
@@ -16,46 +26,267 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 TOKEN = os.getenv('DISCORD_TOKEN')
 
+# Extensions loaded at startup. Listed explicitly so boot does not depend on
+# scanning the cogs directory.
+EXTENSIONS = (
+    "cogs.slash_commands",
+    "cogs.fun",
+    "cogs.games",
+    "cogs.trivia",
+    "cogs.utility",
+    "cogs.stats",
+    "cogs.metrics",
+)
+
+
+def _lean_intents():
+    # Only what the cogs use: guild/channel state, messages and reactions.
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.messages = True
+    intents.reactions = True
+    intents.message_content = True
+    return intents
 
-class Bot(commands.Bot):
-    def __init__(self):
+
+def cache_profile(name):
+    """Client options for a gateway/cache profile.
+
+    ``full``     library defaults: default intents, 1000 cached messages, default member cache
+    ``lean``     only the intents the cogs use, 100 cached messages, no member cache
+    ``minimal``  like ``lean`` but without a message cache
+    """
+    if name == "full":
         intents = discord.Intents.default()
         intents.message_content = True
+        return {"intents": intents}
+    if name == "lean":
+        return {"intents": _lean_intents(), "max_messages": 100,
+                "member_cache_flags": discord.MemberCacheFlags.none(), "chunk_guilds_at_startup": False}
+    if name == "minimal":
+        return {"intents": _lean_intents(), "max_messages": None,
+                "member_cache_flags": discord.MemberCacheFlags.none(), "chunk_guilds_at_startup": False}
+    raise ValueError(f"Unknown cache profile: {name}")
+
+
+class _TimedLoader:
+    """Wraps a module loader to time ``exec_module``, then puts the real loader back on the module."""
+
+    def __init__(self, loader):
+        self.loader = loader
+        self.elapsed = 0.0
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+    def exec_module(self, module):
+        started = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.elapsed = time.perf_counter() - started
+            module.__loader__ = module.__spec__.loader = self.loader
+
+
+class BotMixin:
+    """Behaviour shared by the single-connection ``Bot`` and the multi-shard ``ShardedBot``."""
+
+    def __init__(self, **options):
+        options = {**cache_profile(os.getenv('CACHE_PROFILE', 'lean')), **options}
+        # With MESSAGE_CONTENT=0 commands are used as slash commands; text commands only work on mention.
+        self.message_content = os.getenv('MESSAGE_CONTENT', '1') != '0'
+        if not self.message_content:
+            options['intents'].message_content = False
 
         super().__init__(
-            command_prefix='!',
-            intents=intents,
+            command_prefix='!' if self.message_content else commands.when_mentioned,
             help_command=commands.DefaultHelpCommand(),
             description="A fun Discord bot with various features",
-            application_id=os.getenv('APPLICATION_ID')
+            application_id=os.getenv('APPLICATION_ID'),
+            **options
         )
+        self.api_client = None
+        self.state = create_state_backend()
+        self.reactions = ReactionDispatcher()
+        self.events = EventRouter()
+        self.sessions = SessionEngine()
+        self.startup_timings = {}
+        self._import_times = {}
+        self._created_at = time.perf_counter()
+        self._ready_logged = False
+        self.command_hash_path = data_path("command_tree.json")
+        self.watchdog = LoopWatchdog(threshold=float(os.getenv('LOOP_STALL_THRESHOLD', 0.25)))
+        self.stats = None
+        self.stats_path = os.getenv('STATS_DB', data_path("stats.db"))
+        self.dev_guild_ids = [int(g) for g in os.getenv('DEV_GUILD_IDS', '').split(',') if g.strip()]
+
+    def dispatch(self, event_name, /, *args, **kwargs):
+        self.events.dispatch(event_name, *args)
+        if event_name == "message":
+            self.sessions.dispatch(args[0])
+        super().dispatch(event_name, *args, **kwargs)
 
     async def setup_hook(self):
+        if os.getenv('LOOP_WATCHDOG', '1') != '0':
+            self.watchdog.start()
+        self.api_client = ApiClient.from_env()
+        self.stats = StatsStore(self.stats_path, flush_interval=float(os.getenv('STATS_FLUSH_INTERVAL', 10)))
+        self.stats.start()
         await self.load_extensions()
 
+        for guild_id in self.dev_guild_ids:
+            self.tree.copy_global_to(guild=discord.Object(id=guild_id))
+
     async def load_extensions(self):
-        cogs_dir = Path(__file__).parent / "cogs"
-        for file in cogs_dir.glob("*.py"):
-            if file.name != "__init__.py":
-                extension = f"cogs.{file.stem}"
-                try:
-                    await self.load_extension(extension)
-                    logger.info(f"Loaded extension: {extension}")
-                except Exception as e:
-                    logger.error(f"Failed to load extension {extension}: {e}")
+        started = time.perf_counter()
+        for extension in EXTENSIONS:
+            await self._load_extension_timed(extension)
+        logger.info(f"Loaded {len(self.startup_timings)}/{len(EXTENSIONS)} extension(s) in "
+                    f"{(time.perf_counter() - started) * 1000:.1f}ms")
+
+    async def _load_extension_timed(self, extension):
+        started = time.perf_counter()
+        try:
+            await self.load_extension(extension)
+        except Exception as e:
+            logger.error(f"Failed to load extension {extension}: {e}")
+            return
+
+        import_time = self._import_times.pop(extension, 0.0)
+        setup = time.perf_counter() - started - import_time
+        self.startup_timings[extension] = {"import": import_time, "setup": setup}
+        logger.info(f"Loaded extension: {extension} (import {import_time * 1000:.1f}ms, "
+                    f"setup {setup * 1000:.1f}ms)")
+
+    async def _load_from_module_spec(self, spec, key):
+        # discord.py executes the extension module and then awaits its setup() entry point, which
+        # constructs the cogs. Time the module execution on its own; the rest of the load is setup.
+        loader = spec.loader = _TimedLoader(spec.loader)
+        try:
+            await super()._load_from_module_spec(spec, key)
+        finally:
+            self._import_times[key] = loader.elapsed
+
+    async def get_or_fetch_channel(self, channel_id):
+        """Return a channel from the cache, falling back to a REST fetch."""
+        channel = self.get_channel(channel_id)
+        if channel is None:
+            try:
+                channel = await self.fetch_channel(channel_id)
+            except discord.HTTPException:
+                return None
+        return channel
+
+    async def get_or_fetch_member(self, guild, user_id):
+        """Return a guild member; with the member cache disabled this usually needs a REST fetch."""
+        member = guild.get_member(user_id)
+        if member is None:
+            try:
+                member = await guild.fetch_member(user_id)
+            except discord.HTTPException:
+                return None
+        return member
+
+    @property
+    def is_primary_shard(self):
+        """True for the process that runs shard 0 (or the only connection); it owns global work."""
+        shard_ids = getattr(self, 'shard_ids', None)
+        if shard_ids is not None:
+            return 0 in shard_ids
+        return self.shard_id in (None, 0)
+
+    def owns_guild(self, guild_id):
+        """Whether events for ``guild_id`` are delivered to this process. DMs (guild 0) belong to shard 0."""
+        if not self.shard_count or self.shard_count == 1:
+            return True
+        shard_ids = getattr(self, 'shard_ids', None)
+        if shard_ids is None:
+            if isinstance(self, discord.AutoShardedClient):
+                # Without explicit shard_ids an AutoShardedBot runs every shard.
+                return True
+            shard_ids = [self.shard_id or 0]
+        return (guild_id >> 22) % self.shard_count in shard_ids
 
     async def on_ready(self):
         logger.info(f'{self.user.name} has connected to Discord!')
         logger.info(f'Bot is in {len(self.guilds)} guilds')
 
-        try:
-            synced = await self.tree.sync()
-            logger.info(f"Synced {len(synced)} command(s)")
-        except Exception as e:
-            logger.error(f"Failed to sync commands: {e}")
+        if self.is_primary_shard:
+            try:
+                await self.sync_commands()
+            except Exception as e:
+                logger.error(f"Failed to sync commands: {e}")
 
         await self.change_presence(activity=discord.Game(name="!help for commands"))
 
+        if not self._ready_logged:
+            self._ready_logged = True
+            logger.info(f"Time to ready: {time.perf_counter() - self._created_at:.2f}s")
+
+    def command_tree_hash(self, guild=None):
+        """Stable hash of the application commands that would be synced for ``guild``."""
+        payload = sorted((command.to_dict(self.tree) for command in self.tree.get_commands(guild=guild)),
+                         key=lambda c: (c.get("type", 1), c["name"]))
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    async def sync_commands(self):
+        """Sync the command tree, skipping targets whose commands have not changed since the last sync.
+
+        When DEV_GUILD_IDS is set only those guilds are synced, which propagates instantly.
+        """
+        if self.dev_guild_ids:
+            targets = [(f"guild:{guild_id}", discord.Object(id=guild_id)) for guild_id in self.dev_guild_ids]
+        else:
+            targets = [("global", None)]
+
+        synced_hashes = load_json(self.command_hash_path, {})
+        for key, guild in targets:
+            digest = self.command_tree_hash(guild)
+            if synced_hashes.get(key) == digest:
+                logger.info(f"Command tree unchanged for {key}, skipping sync")
+                continue
+
+            started = time.perf_counter()
+            synced = await self.tree.sync(guild=guild)
+            logger.info(f"Synced {len(synced)} command(s)")
+            logger.info(f"Command tree sync took {(time.perf_counter() - started) * 1000:.1f}ms")
+
+            synced_hashes[key] = digest
+            save_json(self.command_hash_path, synced_hashes)
+
+    async def close(self):
+        self.watchdog.stop()
+        self.reactions.close()
+        self.sessions.close()
+        await super().close()
+        if self.api_client is not None:
+            await self.api_client.close()
+            self.api_client = None
+        if self.stats is not None:
+            await self.stats.close()
+            self.stats = None
+        self.state.close()
+
+
+class Bot(BotMixin, commands.Bot):
+    """Bot running a single gateway connection."""
+
+
+class ShardedBot(BotMixin, commands.AutoShardedBot):
+    """Bot running several gateway shards in one process (all of them unless ``shard_ids`` is given)."""
+
+
+def run(coro):
+    """Run ``coro`` to completion, on uvloop when ``UVLOOP=1`` and it is installed."""
+    if os.getenv('UVLOOP') == '1':
+        try:
+            import uvloop
+        except ImportError:
+            logger.warning("UVLOOP=1 but uvloop is not installed, using the default event loop")
+        else:
+            return uvloop.run(coro)
+    return asyncio.run(coro)
+
 
 async def main():
     bot = Bot()
@@ -64,4 +295,4 @@ async def main():
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    run(main())
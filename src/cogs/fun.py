@@ -1,84 +1,96 @@
 import random as rd
 import discord
 import os
+from discord import app_commands
 from discord.ext import commands
-import aiohttp
+from src.utils.emoji import sample_emojis
+from src.utils.gif_pool import GifPool
+from src.utils.json_decoding import Projection
 import asyncio
 
 
+GIPHY_SEARCH_URL = "https://api.giphy.com/v1/gifs/search"
+GIPHY_PAGE_SIZE = 25
+# Each Giphy result carries a dozen renditions; keep one URL per result and the total for paging.
+GIPHY_PROJECTION = Projection("data.images.original.url", "pagination.total_count")
+GIF_POOL_TTL = float(os.getenv("GIF_POOL_TTL", 600))
+GIF_POOL_MAX_URLS = int(os.getenv("GIF_POOL_MAX_URLS", 5000))
+
+
 class Fun(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.session = aiohttp.ClientSession()
-
-    def cog_unload(self):
-        self.bot.loop.create_task(self.session.close())
+        self.api_client = bot.api_client
+        self.gif_pool = GifPool(self._search_gifs, ttl=GIF_POOL_TTL, max_urls=GIF_POOL_MAX_URLS)
 
-    @commands.command(name="joke")
+    @commands.hybrid_command(name="joke", description="Tell a random joke")
     async def joke(self, ctx):
-        async with self.session.get("https://official-joke-api.appspot.com/random_joke") as response:
-            if response.status == 200:
-                data = await response.json()
-                setup = data["setup"]
-                punchline = data["punchline"]
-                await ctx.send(f"{setup}\n\n||{punchline}||")
-            else:
-                await ctx.send("Failed to fetch a joke. Try again later.")
+        await ctx.typing()
+        data = await self.api_client.get("https://official-joke-api.appspot.com/random_joke")
+        if data:
+            setup = data["setup"]
+            punchline = data["punchline"]
+            await ctx.send(f"{setup}\n\n||{punchline}||")
+        else:
+            await ctx.send("Failed to fetch a joke. Try again later.")
 
-    @commands.command(name="gif")
+    @commands.hybrid_command(name="gif", description="Send a random GIF")
+    @app_commands.describe(query="What to search GIPHY for")
     async def gif(self, ctx, *, query: str = None):
+        await ctx.typing()
         if not query:
             query = rd.choice(["funny", "cool", "amazing", "wow", "cute"])
 
-        api_key = os.getenv("GIPHY_API_KEY")
-        if not api_key:
+        if not os.getenv("GIPHY_API_KEY"):
             await ctx.send("GIPHY API key not configured.")
             return
 
         try:
-            url = "https://api.giphy.com/v1/gifs/search"
-            params = {
-                "q": query,
-                "api_key": api_key,
-                "limit": 25,
-                "rating": "g"
-            }
-
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data["data"]:
-                        gif = rd.choice(data["data"])
-                        gif_url = gif["images"]["original"]["url"]
-
-                        embed = discord.Embed(color=discord.Color.random())
-                        embed.set_image(url=gif_url)
-                        embed.set_footer(text=f"Search: {query} | Powered by GIPHY")
-                        await ctx.send(embed=embed)
-                    else:
-                        await ctx.send(f"No GIFs found for '{query}'.")
-                else:
-                    await ctx.send(f"Failed to fetch a GIF. Status code: {response.status}")
+            gif_url = await self.gif_pool.take(query)
+            if gif_url is not None:
+                embed = discord.Embed(color=discord.Color.random())
+                embed.set_image(url=gif_url)
+                embed.set_footer(text=f"Search: {query} | Powered by GIPHY")
+                await ctx.send(embed=embed)
+            elif self.gif_pool.no_results(query):
+                await ctx.send(f"No GIFs found for '{query}'.")
+            else:
+                await ctx.send("Failed to fetch a GIF. Try again later.")
         except Exception as e:
             await ctx.send(f"An error occurred: {str(e)}")
 
-    @commands.command(name="meme")
+    async def _search_gifs(self, query, offset):
+        params = {
+            "q": query,
+            "api_key": os.getenv("GIPHY_API_KEY"),
+            "limit": GIPHY_PAGE_SIZE,
+            "offset": offset,
+            "rating": "g"
+        }
+        data = await self.api_client.get(GIPHY_SEARCH_URL, params=params, projection=GIPHY_PROJECTION)
+        if data is None:
+            return None
+        urls = [gif["images"]["original"]["url"] for gif in data["data"]]
+        return urls, data.get("pagination", {}).get("total_count", offset + len(urls))
+
+    @commands.hybrid_command(name="meme", description="Send a random meme")
     async def meme(self, ctx):
+        await ctx.typing()
         try:
-            async with self.session.get("https://meme-api.herokuapp.com/gimme") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    embed = discord.Embed(title=data["title"], color=discord.Color.random())
-                    embed.set_image(url=data["url"])
-                    embed.set_footer(text=f" {data['ups']} | From r/{data['subreddit']}")
-                    await ctx.send(embed=embed)
-                else:
-                    await ctx.send("Failed to fetch a meme. Try again later.")
+            data = await self.api_client.get("https://meme-api.herokuapp.com/gimme")
+            if data:
+                embed = discord.Embed(title=data["title"], color=discord.Color.random())
+                embed.set_image(url=data["url"])
+                embed.set_footer(text=f" {data['ups']} | From r/{data['subreddit']}")
+                await ctx.send(embed=embed)
+            else:
+                await ctx.send("Failed to fetch a meme. Try again later.")
         except Exception as e:
             await ctx.send(f"An error occurred: {str(e)}")
 
-    @commands.command(name="8ball", aliases=["eightball", "fortune"])
-    async def eightball(self, ctx, *, question=None):
+    @commands.hybrid_command(name="8ball", aliases=["eightball", "fortune"], description="Ask the magic 8-ball")
+    @app_commands.describe(question="Your yes/no question")
+    async def eightball(self, ctx, *, question: str = None):
         if not question:
             await ctx.send("Please ask a question for the magic 8-ball!")
             return
@@ -99,7 +111,7 @@ class Fun(commands.Cog):
         embed.add_field(name="Magic 8-Ball says", value=response, inline=False)
         await ctx.send(embed=embed)
 
-    @commands.command(name="flip", aliases=["coin"])
+    @commands.hybrid_command(name="flip", aliases=["coin"], description="Flip a coin")
     async def flip(self, ctx):
         result = rd.choice(["Heads", "Tails"])
 
@@ -119,7 +131,7 @@ class Fun(commands.Cog):
 
         await ctx.send(embed=embed)
 
-    @commands.command(name="fireworks")
+    @commands.hybrid_command(name="fireworks", description="React to the next message with fireworks")
     async def fireworks(self, ctx):
         await ctx.send("💥 **Fireworks ready!** The next message will get a surprise...")
 
@@ -127,33 +139,11 @@ class Fun(commands.Cog):
             return message.channel == ctx.channel and not message.author.bot
 
         try:
-            message = await self.bot.wait_for('message', check=check, timeout=60.0)
-
-            emoji_ranges = [
-                (0x1F600, 0x1F64F),  # Emoticons
-                (0x1F300, 0x1F5FF),  # Misc Symbols and Pictographs
-                (0x1F680, 0x1F6FF),  # Transport and Map
-                (0x2600, 0x26FF),  # Misc symbols
-                (0x1F700, 0x1F77F),  # Alchemical Symbols
-            ]
-
-            emoji_list = []
-            for start, end in emoji_ranges:
-                for codepoint in range(start, end + 1):
-                    try:
-                        emoji = chr(codepoint)
-                        emoji_list.append(emoji)
-                    except (ValueError, UnicodeEncodeError):
-                        continue
-
-            selected_emojis = rd.sample(emoji_list, min(20, len(emoji_list)))
-
-            for emoji in selected_emojis:
-                try:
-                    await message.add_reaction(emoji)
-                    #await asyncio.sleep(0.1)
-                except discord.HTTPException:
-                    continue
+            message = await self.bot.events.wait_for_message(ctx.channel.id, check=check, timeout=60.0)
+
+            selected_emojis = sample_emojis(20)
+
+            self.bot.reactions.add(message, selected_emojis)
 
             await ctx.send(f"💥 Fireworks for {message.author.mention}! 🎉")
 
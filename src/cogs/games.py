@@ -2,146 +2,340 @@ import random as rd
 import asyncio
 import discord
 import os
+import time
+import logging
+from discord import app_commands
 from discord.ext import commands
+from src.utils.streaming import StreamingMessage, render_text
+from src.utils.sessions import GameSession
+from src.utils.metrics import FALLBACKS
+from src.utils.storage import data_path
+from src.utils.wordlist import WordIndex
+from src.utils.adventure_pool import AdventurePool, BATCH_PROMPT, parse_scenarios
+
+logger = logging.getLogger(__name__)
+
+OPENAI_HOST = "api.openai.com"
+# Session keys expire on their own if a worker dies mid-game; refreshed on every turn.
+WORD_GAME_TTL = 120
+# Discord allows roughly five edits per five seconds on a message.
+STREAM_EDIT_INTERVAL = float(os.getenv("STREAM_EDIT_INTERVAL", "1.0"))
+# Sorted word list for strict word games, see src/utils/wordlist.py.
+WORDGAME_DICTIONARY = os.getenv("WORDGAME_DICTIONARY", str(data_path("words.txt")))
+
+FALLBACK_CHOICES = ["The dark, overgrown path", "The sunny, clear trail", "The narrow, winding road"]
+FALLBACK_OUTCOMES = [
+    "You take the dark path and discover an ancient ruin filled with treasure! However, a dragon guards it...",
+    "You follow the sunny trail to a peaceful village. The villagers welcome you and offer you a place to stay.",
+    "You navigate the winding road and stumble upon a magical portal. Do you dare to step through?"
+]
+# Shown when a streamed outcome breaks off; the choice was made, so the adventure still ends.
+INTERRUPTED_OUTCOME = "A thick fog rolls in before you can see how it ends, but you make it home with a story to tell."
+
+
+class WordGameSession(GameSession):
+    __slots__ = ("state", "session_key", "words", "used_words", "last_letter", "stats", "guild_id", "players",
+                 "chain")
+
+    def __init__(self, channel_id, send, state, session_key, first_word, words=None, stats=None, guild_id=None):
+        super().__init__(channel_id, send)
+        self.state = state
+        self.session_key = session_key
+        # Strict games check words against the dictionary and the bot takes turns.
+        self.words = words
+        self.used_words = {first_word}
+        self.last_letter = first_word[-1]
+        self.stats = stats
+        self.guild_id = guild_id
+        self.players = set()
+        self.chain = 0
+
+    def accepts(self, message):
+        return not message.author.bot and message.content.lower().isalpha()
+
+    async def on_message(self, message):
+        word = message.content.lower()
+
+        if not word.startswith(self.last_letter):
+            await self.send(f"Your word must start with the letter **{self.last_letter}**! Game over.")
+            return True
+
+        if word in self.used_words:
+            await self.send(f"The word **{word}** has already been used! Game over.")
+            return True
+
+        if self.words is not None and word not in self.words:
+            await self.send(f"**{word}** isn't in my dictionary! Game over.")
+            return True
+
+        self.used_words.add(word)
+        self.last_letter = word[-1]
+        self.chain += 1
+        self.players.add(message.author.id)
+        if self.stats is not None and self.guild_id is not None:
+            self.stats.increment(self.guild_id, message.author.id, "wordgame_words")
+        self.touch()
+        await self.state.set(self.session_key, True, ttl=WORD_GAME_TTL)
+
+        await message.add_reaction("✅")
+
+        if self.words is not None:
+            reply = self.words.random_word(self.last_letter, exclude=self.used_words)
+            if reply is None:
+                await self.send(f"I can't think of a word starting with **{self.last_letter}**. You win!")
+                return True
+            self.used_words.add(reply)
+            self.last_letter = reply[-1]
+            await self.send(f"My word: **{reply}**")
+        return False
+
+    async def on_timeout(self):
+        await self.send("Time's up! No one responded in time. Game over.")
+
+    async def on_end(self):
+        if self.stats is not None and self.guild_id is not None:
+            for user_id in self.players:
+                self.stats.record_max(self.guild_id, user_id, "wordgame_longest_chain", self.chain)
+        await self.state.delete(self.session_key)
 
 
 class Games(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.word_game_active = {}
         self.common_words = ["python", "discord", "bot", "game", "programming", "computer", "keyboard", "internet",
                              "server"]
-        self.api_client = None
+        self.api_client = bot.api_client
+        self._openai = None
+        self.words = WordIndex.load(WORDGAME_DICTIONARY)
+        self.adventure_pool = AdventurePool(self._generate_adventures)
+        self._warmup_task = None
+
+    @commands.hybrid_command(name="wordgame", description="Start a word chain game")
+    @app_commands.describe(mode="'strict' to only allow dictionary words and play against the bot")
+    async def word_game(self, ctx, mode: str = None):
+        strict = mode is not None and mode.lower() == "strict"
+        if strict and self.words is None:
+            await ctx.send("Strict mode isn't available: no dictionary is installed.")
+            return
 
-    @commands.command(name="wordgame")
-    async def word_game(self, ctx):
-        if ctx.channel.id in self.word_game_active:
+        session_key = f"wordgame:{ctx.channel.id}"
+        if not await self.bot.state.add(session_key, True, ttl=WORD_GAME_TTL):
             await ctx.send("A word game is already active in this channel!")
             return
 
-        self.word_game_active[ctx.channel.id] = True
-        await ctx.send("**Word Chain Game Started!**\nEach word must start with the last letter of the previous word.")
+        current_word = strict and self.words.random_word(rd.choice("abcdefghilmnoprstw"))
+        if not current_word:
+            current_word = rd.choice(self.common_words)
+        session = WordGameSession(ctx.channel.id, ctx.send, self.bot.state, session_key, current_word,
+                                  words=self.words if strict else None, stats=self.bot.stats,
+                                  guild_id=ctx.guild and ctx.guild.id)
+        if not self.bot.sessions.start(session):
+            await self.bot.state.delete(session_key)
+            await ctx.send("A word game is already active in this channel!")
+            return
 
-        current_word = rd.choice(self.common_words)
+        await ctx.send("**Word Chain Game Started!**\nEach word must start with the last letter of the previous word.")
         await ctx.send(f"I'll start with: **{current_word}**")
 
-        used_words = {current_word}
-        last_letter = current_word[-1]
-
-        def check(message):
-            return (message.channel == ctx.channel and
-                    not message.author.bot and
-                    message.content.lower().isalpha())
-
-        try:
-            while True:
-                response = await self.bot.wait_for('message', timeout=30.0, check=check)
-                word = response.content.lower()
-
-                if not word.startswith(last_letter):
-                    await ctx.send(f"Your word must start with the letter **{last_letter}**! Game over.")
-                    break
-
-                if word in used_words:
-                    await ctx.send(f"The word **{word}** has already been used! Game over.")
-                    break
-
-                used_words.add(word)
-                last_letter = word[-1]
-
-                await response.add_reaction("✅")
-
-        except asyncio.TimeoutError:
-            await ctx.send("Time's up! No one responded in time. Game over.")
-        finally:
-            del self.word_game_active[ctx.channel.id]
-
-    @commands.command(name="adventure")
+    @commands.hybrid_command(name="adventure", description="Play a short choose-your-path adventure")
     async def mini_adventure(self, ctx):
+        await ctx.typing()
+        adventure = self.adventure_pool.take()
+        if adventure is not None:
+            await self._pooled_adventure(ctx, adventure)
+            return
+
         try:
             from openai import AsyncOpenAI
-            success = await self._adventure_openai(ctx)
+            # Skip OpenAI entirely while its circuit breaker is open.
+            success = self.api_client.is_available(OPENAI_HOST) and await self._adventure_openai(ctx)
+
+            if not success:
+                success = await self._adventure_api_ninjas(ctx)
 
             if not success:
-                await self._adventure_api_ninjas(ctx)
+                await self._fallback_adventure(ctx)
 
         except Exception as e:
-            print(f"Adventure error: {e}")
+            logger.error(f"Adventure error: {e}")
             await self._fallback_adventure(ctx)
 
-    async def _adventure_openai(self, ctx):
-        try:
+    def _openai_client(self):
+        if self._openai is None:
             from openai import AsyncOpenAI
-            client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-            response = await client.chat.completions.create(
+            self._openai = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return self._openai
+
+    async def cog_load(self):
+        if os.getenv("OPENAI_API_KEY"):
+            self._warmup_task = asyncio.create_task(self._warm_adventure_pool())
+
+    async def cog_unload(self):
+        if self._warmup_task is not None:
+            self._warmup_task.cancel()
+        await self.adventure_pool.close()
+        if self.words is not None:
+            self.words.close()
+        if self._openai is not None:
+            await self._openai.close()
+            self._openai = None
+
+    async def _warm_adventure_pool(self):
+        await self.bot.wait_until_ready()
+        self.adventure_pool.load()
+        self.adventure_pool.schedule_refill()
+
+    async def _generate_adventures(self, count):
+        """Generate ``count`` adventures in a single completion for the pool."""
+        if not os.getenv("OPENAI_API_KEY") or not self.api_client.is_available(OPENAI_HOST):
+            return []
+        try:
+            response = await self._openai_client().chat.completions.create(
                 model="gpt-3.5-turbo",
-                messages=[{
-                    "role": "system",
-                    "content": "Generate a short adventure scenario with three choices. Keep it under 100 words."
-                }],
-                max_tokens=150,
-                temperature=0.8
+                messages=[{"role": "system", "content": BATCH_PROMPT.format(count=count)}],
+                max_tokens=250 * count,
+                temperature=0.9,
+                response_format={"type": "json_object"}
             )
+        except Exception as e:
+            logger.error(f"OpenAI adventure batch error: {e}")
+            self.api_client.record_failure(OPENAI_HOST)
+            return []
+
+        self.api_client.record_success(OPENAI_HOST)
+        return parse_scenarios(response.choices[0].message.content)
+
+    async def _stream_completion(self, streamer, messages, max_tokens):
+        """Stream a chat completion into ``streamer``, which edits its message as tokens arrive."""
+        stream = await self._openai_client().chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=0.8,
+            stream=True
+        )
+
+        async def deltas():
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        await streamer.consume(deltas())
+
+    async def _adventure_openai(self, ctx):
+        """Play an adventure with a streamed scenario and outcome.
+
+        Returns False only if the scenario failed before anything was shown, so the
+        caller can try another source. Once a message is in the channel, errors are
+        handled in place by finishing it with static content.
+        """
+        def render_scenario(text):
+            return {"embed": discord.Embed(title="Adventure", description=text, color=discord.Color.green())}
+
+        streamer = StreamingMessage(ctx.send, render_scenario, min_interval=STREAM_EDIT_INTERVAL,
+                                    label="Adventure scenario", started=time.monotonic())
+        outcomes = None
+        try:
+            await self._stream_completion(streamer, [{
+                "role": "system",
+                "content": "Generate a short adventure scenario with three choices. Keep it under 100 words."
+            }], 150)
+            self.api_client.record_success(OPENAI_HOST)
+        except Exception as e:
+            logger.error(f"OpenAI adventure error: {e}")
+            self.api_client.record_failure(OPENAI_HOST)
+            if streamer.message is None:
+                return False
+            # The half-written scenario is already in the channel: turn it into the static adventure.
+            FALLBACKS.inc(feature="adventure")
+            outcomes = FALLBACK_OUTCOMES
 
-            scenario = response.choices[0].message.content
+        scenario = streamer.text
+        if outcomes is None:
             parts = scenario.split("\n")
             main_scenario = parts[0]
-
-            embed = discord.Embed(title="Adventure", description=main_scenario, color=discord.Color.green())
-
             choices = ["Proceed carefully", "Take a bold approach", "Find another way"]
             if len(parts) > 3:
                 for i in range(1, min(4, len(parts))):
                     if parts[i].strip():
                         choices[i - 1] = parts[i].strip()
+        else:
+            main_scenario = "You find yourself at a crossroads in a mysterious forest. Which path do you take?"
+            choices = FALLBACK_CHOICES
 
-            embed.add_field(name="1️⃣", value=choices[0], inline=True)
-            embed.add_field(name="2️⃣", value=choices[1], inline=True)
-            embed.add_field(name="3️⃣", value=choices[2], inline=True)
+        embed = discord.Embed(title="Adventure", description=main_scenario, color=discord.Color.green())
+        embed.add_field(name="1️⃣", value=choices[0], inline=True)
+        embed.add_field(name="2️⃣", value=choices[1], inline=True)
+        embed.add_field(name="3️⃣", value=choices[2], inline=True)
 
-            message = await ctx.send(embed=embed)
-            options = ["1️⃣", "2️⃣", "3️⃣"]
-
-            for option in options:
-                await message.add_reaction(option)
+        message = await streamer.finish(embed=embed)
+        options = ["1️⃣", "2️⃣", "3️⃣"]
 
-            def check(reaction, user):
-                return user == ctx.author and str(reaction.emoji) in options and reaction.message.id == message.id
+        self.bot.reactions.add(message, options)
 
-            try:
-                reaction, user = await self.bot.wait_for('reaction_add', timeout=60.0, check=check)
-                choice_idx = options.index(str(reaction.emoji))
+        def check(payload):
+            return payload.user_id == ctx.author.id and str(payload.emoji) in options
 
-                outcome_response = await client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "Generate a brief outcome for an adventure choice."},
-                        {"role": "user", "content": f"Scenario: {scenario}\n\nChosen option: {choices[choice_idx]}"}
-                    ],
-                    max_tokens=100,
-                    temperature=0.8
-                )
+        try:
+            payload = await self.bot.events.wait_for_reaction(message.id, check=check, timeout=60.0)
+        except asyncio.TimeoutError:
+            self.bot.reactions.cancel(message)
+            await ctx.send(
+                "You stood at the crossroads too long and night fell. You decide to make camp and try again tomorrow.")
+            return True
 
-                outcome = outcome_response.choices[0].message.content
-                await ctx.send(outcome)
-                return True
+        self.bot.reactions.cancel(message)
+        choice_idx = options.index(str(payload.emoji))
+        self._record_adventure(ctx)
 
-            except asyncio.TimeoutError:
-                await ctx.send(
-                    "You stood at the crossroads too long and night fell. You decide to make camp and try again tomorrow.")
-                return True
+        if outcomes is not None:
+            await ctx.send(outcomes[choice_idx])
+            return True
 
+        outcome = StreamingMessage(ctx.send, render_text, min_interval=STREAM_EDIT_INTERVAL, label="Adventure outcome")
+        try:
+            await self._stream_completion(outcome, [
+                {"role": "system", "content": "Generate a brief outcome for an adventure choice."},
+                {"role": "user", "content": f"Scenario: {scenario}\n\nChosen option: {choices[choice_idx]}"}
+            ], 100)
         except Exception as e:
-            print(f"OpenAI adventure error: {e}")
-            return False
+            logger.error(f"OpenAI adventure outcome error: {e}")
+            self.api_client.record_failure(OPENAI_HOST)
+            FALLBACKS.inc(feature="adventure")
+            await outcome.finish(content=INTERRUPTED_OUTCOME)
+            return True
+
+        await outcome.finish()
+        return True
+
+    def _record_adventure(self, ctx):
+        if self.bot.stats is not None and ctx.guild is not None:
+            self.bot.stats.increment(ctx.guild.id, ctx.author.id, "adventures_completed")
+
+    async def _pooled_adventure(self, ctx, adventure):
+        embed = discord.Embed(title="Adventure", description=adventure["scenario"], color=discord.Color.green())
+        options = ["1️⃣", "2️⃣", "3️⃣"]
+        for option, choice in zip(options, adventure["choices"]):
+            embed.add_field(name=option, value=choice, inline=True)
+
+        message = await ctx.send(embed=embed)
+        self.bot.reactions.add(message, options)
+
+        def check(payload):
+            return payload.user_id == ctx.author.id and str(payload.emoji) in options
 
-    async def _adventure_api_ninjas(self, ctx):
         try:
-            if self.api_client is None:
-                from src.utils.api_client import ApiClient
-                self.api_client = ApiClient()
+            payload = await self.bot.events.wait_for_reaction(message.id, check=check, timeout=60.0)
+            self.bot.reactions.cancel(message)
+            self._record_adventure(ctx)
+            await ctx.send(adventure["outcomes"][options.index(str(payload.emoji))])
+        except asyncio.TimeoutError:
+            self.bot.reactions.cancel(message)
+            await ctx.send(
+                "You stood at the crossroads too long and night fell. You decide to make camp and try again tomorrow.")
 
+    async def _adventure_api_ninjas(self, ctx):
+        try:
             prompt = "A short fantasy adventure scenario with choices"
             data = await self.api_client.get("https://api.api-ninjas.com/v1/facts",
                                              #params={"limit": 1},
@@ -161,15 +355,16 @@ class Games(commands.Cog):
                 message = await ctx.send(embed=embed)
                 options = ["1️⃣", "2️⃣", "3️⃣"]
 
-                for option in options:
-                    await message.add_reaction(option)
+                self.bot.reactions.add(message, options)
 
-                def check(reaction, user):
-                    return user == ctx.author and str(reaction.emoji) in options and reaction.message.id == message.id
+                def check(payload):
+                    return payload.user_id == ctx.author.id and str(payload.emoji) in options
 
                 try:
-                    reaction, user = await self.bot.wait_for('reaction_add', timeout=60.0, check=check)
-                    choice_idx = options.index(str(reaction.emoji))
+                    payload = await self.bot.events.wait_for_reaction(message.id, check=check, timeout=60.0)
+                    self.bot.reactions.cancel(message)
+                    choice_idx = options.index(str(payload.emoji))
+                    self._record_adventure(ctx)
 
                     outcomes = [
                         "Your heroic approach leads you to face the challenge directly. After a fierce struggle, you emerge victorious and gain valuable treasure and recognition!",
@@ -181,52 +376,43 @@ class Games(commands.Cog):
                     return True
 
                 except asyncio.TimeoutError:
+                    self.bot.reactions.cancel(message)
                     await ctx.send("You took too long to decide. The opportunity passes.")
                     return True
             else:
                 return False
 
         except Exception as e:
-            print(f"API Ninjas adventure error: {e}")
+            logger.error(f"API Ninjas adventure error: {e}")
             return False
 
     async def _fallback_adventure(self, ctx):
+        FALLBACKS.inc(feature="adventure")
         await ctx.send("You find yourself at a crossroads in a mysterious forest. Which path do you take?")
 
         embed = discord.Embed(title="Choose Your Path", color=discord.Color.green())
-        embed.add_field(name="1️⃣", value="The dark, overgrown path", inline=True)
-        embed.add_field(name="2️⃣", value="The sunny, clear trail", inline=True)
-        embed.add_field(name="3️⃣", value="The narrow, winding road", inline=True)
+        for option, choice in zip(["1️⃣", "2️⃣", "3️⃣"], FALLBACK_CHOICES):
+            embed.add_field(name=option, value=choice, inline=True)
 
         message = await ctx.send(embed=embed)
         options = ["1️⃣", "2️⃣", "3️⃣"]
 
-        for option in options:
-            await message.add_reaction(option)
+        self.bot.reactions.add(message, options)
 
-        def check(reaction, user):
-            return user == ctx.author and str(reaction.emoji) in options and reaction.message.id == message.id
+        def check(payload):
+            return payload.user_id == ctx.author.id and str(payload.emoji) in options
 
         try:
-            reaction, user = await self.bot.wait_for('reaction_add', timeout=60.0, check=check)
-
-            if str(reaction.emoji) == "1️⃣":
-                await ctx.send(
-                    "You take the dark path and discover an ancient ruin filled with treasure! However, a dragon guards it...")
-            elif str(reaction.emoji) == "2️⃣":
-                await ctx.send(
-                    "You follow the sunny trail to a peaceful village. The villagers welcome you and offer you a place to stay.")
-            else:
-                await ctx.send(
-                    "You navigate the winding road and stumble upon a magical portal. Do you dare to step through?")
+            payload = await self.bot.events.wait_for_reaction(message.id, check=check, timeout=60.0)
+            self.bot.reactions.cancel(message)
+            self._record_adventure(ctx)
+
+            await ctx.send(FALLBACK_OUTCOMES[options.index(str(payload.emoji))])
 
         except asyncio.TimeoutError:
+            self.bot.reactions.cancel(message)
             await ctx.send(
                 "You stood at the crossroads too long and night fell. You decide to make camp and try again tomorrow.")
 
-    def cog_unload(self):
-        if self.api_client is not None:
-            self.bot.loop.create_task(self.api_client.close())
-
 async def setup(bot):
     await bot.add_cog(Games(bot))
\ No newline at end of file
@@ -0,0 +1,69 @@
+import os
+import math
+import time
+import logging
+from discord.ext import commands, tasks
+from src.utils.metrics import ACTIVE_GAMES, COMMAND_DURATION, GATEWAY_LATENCY, MetricsServer
+
+logger = logging.getLogger(__name__)
+
+# The endpoint is off unless a port is set. Worker processes add their worker id to the port.
+METRICS_PORT = os.getenv("METRICS_PORT")
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+
+
+class Metrics(commands.Cog):
+    """Records command and gateway metrics and serves them on a local HTTP endpoint."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._started = {}
+        self.server = None
+        if METRICS_PORT:
+            port = int(METRICS_PORT) + int(os.getenv("BOTZILLA_WORKER_ID", 0))
+            self.server = MetricsServer(METRICS_HOST, port)
+
+    async def cog_load(self):
+        ACTIVE_GAMES.set_function(lambda: len(self.bot.sessions))
+        # Global invoke hooks rather than on_command_error listeners: adding a listener for
+        # on_command_error would switch off the bot's default error logging.
+        self.bot.before_invoke(self._before_invoke)
+        self.bot.after_invoke(self._after_invoke)
+        self.sample_gateway_latency.start()
+        if self.server is not None:
+            try:
+                await self.server.start()
+            except OSError as e:
+                logger.error(f"Failed to start metrics server: {e}")
+
+    async def cog_unload(self):
+        if self.bot._before_invoke == self._before_invoke:
+            self.bot._before_invoke = None
+        if self.bot._after_invoke == self._after_invoke:
+            self.bot._after_invoke = None
+        self.sample_gateway_latency.cancel()
+        if self.server is not None:
+            await self.server.stop()
+
+    async def _before_invoke(self, ctx):
+        self._started[ctx] = time.perf_counter()
+
+    async def _after_invoke(self, ctx):
+        started = self._started.pop(ctx, None)
+        if started is not None and ctx.command is not None:
+            COMMAND_DURATION.observe(time.perf_counter() - started, command=ctx.command.qualified_name,
+                                     outcome="error" if ctx.command_failed else "ok")
+
+    @tasks.loop(seconds=15)
+    async def sample_gateway_latency(self):
+        latency = self.bot.latency
+        if math.isfinite(latency):
+            GATEWAY_LATENCY.observe(latency)
+
+    @sample_gateway_latency.before_loop
+    async def before_sample_gateway_latency(self):
+        await self.bot.wait_until_ready()
+
+
+async def setup(bot):
+    await bot.add_cog(Metrics(bot))
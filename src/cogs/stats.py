@@ -0,0 +1,53 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+# Leaderboard name -> (stat key, label)
+BOARDS = {
+    "trivia": ("trivia_correct", "Trivia answers correct"),
+    "words": ("wordgame_words", "Word chain words played"),
+    "chain": ("wordgame_longest_chain", "Longest word chain"),
+    "adventures": ("adventures_completed", "Adventures completed"),
+}
+
+
+class Stats(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.hybrid_command(name="leaderboard", aliases=["lb"], description="Show this server's top players")
+    @app_commands.describe(board="trivia, words, chain or adventures")
+    @commands.guild_only()
+    async def leaderboard(self, ctx, board: str = "trivia"):
+        board = board.lower()
+        if board not in BOARDS:
+            await ctx.send(f"Unknown leaderboard. Choose one of: {', '.join(BOARDS)}")
+            return
+
+        stat, label = BOARDS[board]
+        top = await self.bot.stats.leaderboard(ctx.guild.id, stat)
+
+        embed = discord.Embed(title=f"🏆 {label}", color=discord.Color.gold())
+        if top:
+            embed.description = "\n".join(f"**{rank}.** <@{user_id}> — {value}"
+                                          for rank, (user_id, value) in enumerate(top, start=1))
+        else:
+            embed.description = "No one is on this leaderboard yet!"
+        embed.set_footer(text=f"Updated every {self.bot.stats.flush_interval:.0f} seconds")
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="stats", description="Show game stats for you or another member")
+    @app_commands.describe(member="Whose stats to show")
+    @commands.guild_only()
+    async def stats(self, ctx, member: discord.Member = None):
+        member = member or ctx.author
+        stats = await self.bot.stats.user_stats(ctx.guild.id, member.id)
+
+        embed = discord.Embed(title=f"Stats for {member.display_name}", color=discord.Color.blue())
+        for stat, label in BOARDS.values():
+            embed.add_field(name=label, value=stats.get(stat, 0), inline=True)
+        await ctx.send(embed=embed)
+
+
+async def setup(bot):
+    await bot.add_cog(Stats(bot))
@@ -2,15 +2,54 @@ import asyncio
 import random as rd
 import discord
 import os
+from discord import app_commands
 from discord.ext import commands
-from src.utils.api_client import ApiClient
+from src.utils.trivia_pool import TriviaPool
+from src.utils.sessions import GameSession
+from src.utils.metrics import FALLBACKS
+
+# Upper bound on a game's length, so a session held by a crashed worker expires.
+TRIVIA_SESSION_TTL = 120
+
+
+class TriviaSession(GameSession):
+    __slots__ = ("state", "session_key", "answers", "correct_answer", "stats", "guild_id")
+
+    def __init__(self, channel_id, send, state, session_key, answers, correct_answer, stats=None, guild_id=None):
+        super().__init__(channel_id, send)
+        self.state = state
+        self.session_key = session_key
+        self.answers = answers
+        self.correct_answer = correct_answer
+        self.stats = stats
+        self.guild_id = guild_id
+
+    def accepts(self, message):
+        return message.content.isdecimal() and 1 <= int(message.content) <= len(self.answers)
+
+    async def on_message(self, message):
+        if self.answers[int(message.content) - 1] == self.correct_answer:
+            if self.stats is not None and self.guild_id is not None:
+                self.stats.increment(self.guild_id, message.author.id, "trivia_correct")
+            await self.send(f"🎉 Correct, {message.author.mention}! The answer is **{self.correct_answer}**.")
+        else:
+            await self.send(
+                f"❌ Sorry {message.author.mention}, that's incorrect. The correct answer is **{self.correct_answer}**.")
+        return True
+
+    async def on_timeout(self):
+        await self.send(f"Time's up! The correct answer was **{self.correct_answer}**.")
+
+    async def on_end(self):
+        await self.state.delete(self.session_key)
 
 
 class Trivia(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.api_client = ApiClient()
-        self.trivia_sessions = {}
+        self.api_client = bot.api_client
+        self.question_pool = TriviaPool(self.api_client)
+        self._warmup_task = None
         self.fallback_riddles = [
             {"question": "What has keys but no locks, space but no room, and you can enter but not go in?",
              "answer": "keyboard"},
@@ -19,70 +58,70 @@ class Trivia(commands.Cog):
             {"question": "What has a head and a tail, but no body?", "answer": "coin"}
         ]
 
-    def cog_unload(self):
-        self.bot.loop.create_task(self.api_client.close())
+    async def cog_load(self):
+        # Warm the pool once the bot is ready rather than slowing down startup.
+        self._warmup_task = asyncio.create_task(self._warm_question_pool())
+
+    async def cog_unload(self):
+        if self._warmup_task is not None:
+            self._warmup_task.cancel()
+        await self.question_pool.close()
+
+    async def _warm_question_pool(self):
+        await self.bot.wait_until_ready()
+        self.question_pool.load()
+        self.question_pool.schedule_refill()
+
+    @commands.hybrid_command(name="trivia", description="Answer a trivia question")
+    @app_commands.describe(difficulty="easy, medium or hard")
+    async def trivia(self, ctx, difficulty: str = None):
+        await ctx.typing()
+        if difficulty is not None:
+            difficulty = difficulty.lower()
+            if difficulty not in ("easy", "medium", "hard"):
+                await ctx.send("Difficulty must be one of: easy, medium, hard")
+                return
 
-    @commands.command(name="trivia")
-    async def trivia(self, ctx):
-        if ctx.channel.id in self.trivia_sessions:
+        session_key = f"trivia:{ctx.channel.id}"
+        if not await self.bot.state.add(session_key, True, ttl=TRIVIA_SESSION_TTL):
             await ctx.send("A trivia game is already active in this channel!")
             return
 
-        self.trivia_sessions[ctx.channel.id] = True
-
-        try:
-            data = await self.api_client.get("https://opentdb.com/api.php?amount=1&encode=url3986")
-
-            if not data or data["response_code"] != 0:
-                await ctx.send("Failed to fetch a trivia question. Try again later.")
-                return
-
-            question_data = data["results"][0]
-
-            from urllib.parse import unquote_plus
-            question = unquote_plus(question_data["question"])
-            correct_answer = unquote_plus(question_data["correct_answer"])
-            incorrect_answers = [unquote_plus(a) for a in question_data["incorrect_answers"]]
-
-            all_answers = incorrect_answers + [correct_answer]
-            rd.shuffle(all_answers)
-
-            embed = discord.Embed(
-                title="Trivia Question",
-                description=question,
-                color=discord.Color.blue()
-            )
-
-            for i, answer in enumerate(all_answers):
-                embed.add_field(name=f"Option {i + 1}", value=answer, inline=False)
+        question_data = await self.question_pool.take(difficulty=difficulty)
+        if question_data is None:
+            await self.bot.state.delete(session_key)
+            await ctx.send("Failed to fetch a trivia question. Try again later.")
+            return
 
-            await ctx.send(embed=embed)
-            await ctx.send("Type the number of your answer!")
+        question = question_data["question"]
+        correct_answer = question_data["correct_answer"]
+        incorrect_answers = list(question_data["incorrect_answers"])
 
-            def check(message):
-                return (message.channel == ctx.channel and
-                        message.content.isdigit() and
-                        1 <= int(message.content) <= len(all_answers))
+        all_answers = incorrect_answers + [correct_answer]
+        rd.shuffle(all_answers)
 
-            try:
-                message = await self.bot.wait_for('message', timeout=30.0, check=check)
-                user_answer = all_answers[int(message.content) - 1]
+        session = TriviaSession(ctx.channel.id, ctx.send, self.bot.state, session_key, all_answers, correct_answer,
+                                stats=self.bot.stats, guild_id=ctx.guild and ctx.guild.id)
+        if not self.bot.sessions.start(session):
+            await self.bot.state.delete(session_key)
+            await ctx.send("A trivia game is already active in this channel!")
+            return
 
-                if user_answer == correct_answer:
-                    await ctx.send(f"🎉 Correct, {message.author.mention}! The answer is **{correct_answer}**.")
-                else:
-                    await ctx.send(
-                        f"❌ Sorry {message.author.mention}, that's incorrect. The correct answer is **{correct_answer}**.")
+        embed = discord.Embed(
+            title="Trivia Question",
+            description=question,
+            color=discord.Color.blue()
+        )
 
-            except asyncio.TimeoutError:
-                await ctx.send(f"Time's up! The correct answer was **{correct_answer}**.")
+        for i, answer in enumerate(all_answers):
+            embed.add_field(name=f"Option {i + 1}", value=answer, inline=False)
 
-        finally:
-            if ctx.channel.id in self.trivia_sessions:
-                del self.trivia_sessions[ctx.channel.id]
+        await ctx.send(embed=embed)
+        await ctx.send("Type the number of your answer!")
 
-    @commands.command(name="riddle")
+    @commands.hybrid_command(name="riddle", description="Get a riddle")
     async def riddle(self, ctx):
+        await ctx.typing()
         try:
             data = await self.api_client.get("https://api.api-ninjas.com/v1/riddles",
                                            headers={"X-Api-Key": os.getenv("API_NINJAS_KEY")})
@@ -92,6 +131,7 @@ class Trivia(commands.Cog):
                 question = riddle.get("question", "")
                 answer = riddle.get("answer", "")
             else:
+                FALLBACKS.inc(feature="riddle")
                 riddle = rd.choice(self.fallback_riddles)
                 question = riddle["question"]
                 answer = riddle["answer"]
@@ -107,6 +147,7 @@ class Trivia(commands.Cog):
             ctx.bot._last_riddle_answer = answer
 
         except Exception as e:
+            FALLBACKS.inc(feature="riddle")
             riddle = rd.choice(self.fallback_riddles)
 
             embed = discord.Embed(
@@ -119,7 +160,7 @@ class Trivia(commands.Cog):
             await ctx.send(embed=embed)
             ctx.bot._last_riddle_answer = riddle["answer"]
 
-    @commands.command(name="answer")
+    @commands.hybrid_command(name="answer", description="Reveal the answer to the last riddle")
     async def answer(self, ctx):
         if hasattr(ctx.bot, '_last_riddle_answer'):
             await ctx.send(f"The answer to the riddle is: ||{ctx.bot._last_riddle_answer}||")
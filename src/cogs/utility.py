@@ -1,110 +1,163 @@
+import os
+import asyncio
 import datetime
+import logging
 import random as rd
-import os
+from collections import defaultdict
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import discord
+from discord import app_commands
 from discord.ext import commands, tasks
-import aiohttp
+from src.utils.birthdays import BirthdayStore
+from src.utils.json_decoding import Projection
+from src.utils.metrics import FALLBACKS
+from src.utils.spotify import SpotifyClient
+from src.utils.storage import data_path
+
+logger = logging.getLogger(__name__)
+
+
+def _birthday_timezone():
+    name = os.getenv("BIRTHDAY_TIMEZONE", "UTC")
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning(f"Unknown BIRTHDAY_TIMEZONE {name!r}, using UTC")
+        return datetime.timezone.utc
+
+
+BIRTHDAY_TZ = _birthday_timezone()
+BIRTHDAY_MENTIONS_PER_MESSAGE = 50
+ON_THIS_DAY_PROJECTION = Projection("events.year", "events.description")
 
 
 class Utility(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.birthdays = {}
-        self.session = aiohttp.ClientSession()
+        self.birthday_store = BirthdayStore(os.getenv("BIRTHDAY_DB", data_path("birthdays.db")))
+        self.announce_concurrency = int(os.getenv("BIRTHDAY_ANNOUNCE_CONCURRENCY", 10))
+        # Shard worker processes share the store, so each tracks its own progress.
+        worker_id = os.getenv("BOTZILLA_WORKER_ID")
+        self.last_announced_key = f"last_announced:{worker_id}" if worker_id else "last_announced"
+        self.api_client = bot.api_client
+        self.spotify = SpotifyClient(self.api_client)
         self.check_birthdays.start()
 
     def cog_unload(self):
         self.check_birthdays.cancel()
-        self.bot.loop.create_task(self.session.close())
+        self.birthday_store.close()
 
-    @commands.command(name="setbirthday")
+    @commands.hybrid_command(name="setbirthday", description="Register your birthday")
+    @app_commands.describe(date="Your birthday as MM-DD")
     async def set_birthday(self, ctx, date: str):
         try:
             month, day = map(int, date.split('-'))
-            if not (1 <= month <= 12 and 1 <= day <= 31):
-                raise ValueError("Invalid month or day")
+            # 2000 is a leap year, so Feb 29 is accepted.
+            datetime.date(2000, month, day)
 
-            self.birthdays[ctx.author.id] = {'month': month, 'day': day, 'channel_id': ctx.channel.id}
+            guild_id = ctx.guild.id if ctx.guild else 0
+            await self.birthday_store.set(guild_id, ctx.author.id, ctx.channel.id, month, day)
             await ctx.send(f"Birthday set for {ctx.author.mention}: {date}")
 
         except (ValueError, IndexError):
             await ctx.send("Please use the format MM-DD (e.g., 12-25 for December 25th)")
 
-    @tasks.loop(hours=24)
+    @tasks.loop(time=datetime.time(0, 0, tzinfo=BIRTHDAY_TZ))
     async def check_birthdays(self):
-        today = datetime.datetime.now()
-        current_month, current_day = today.month, today.day
-
-        for user_id, birthday in self.birthdays.items():
-            if birthday['month'] == current_month and birthday['day'] == current_day:
-                channel = self.bot.get_channel(birthday['channel_id'])
-                if channel:
-                    user = self.bot.get_user(user_id)
-                    if user:
-                        await channel.send(f"🎂 Happy Birthday, {user.mention}! 🎉")
+        await self.announce_birthdays(datetime.datetime.now(BIRTHDAY_TZ).date())
 
     @check_birthdays.before_loop
     async def before_check_birthdays(self):
         await self.bot.wait_until_ready()
 
-    @commands.command(name="fact")
+        # Catch up if the bot was offline at midnight, without repeating today's wishes on restart.
+        today = datetime.datetime.now(BIRTHDAY_TZ).date()
+        if await self.birthday_store.get_meta(self.last_announced_key) != today.isoformat():
+            await self.announce_birthdays(today)
+
+    async def announce_birthdays(self, date):
+        rows = await self.birthday_store.for_date(date)
+
+        users_by_channel = defaultdict(list)
+        for guild_id, user_id, channel_id in rows:
+            # Only announce for guilds on this process's shards.
+            if not self.bot.owns_guild(guild_id):
+                continue
+            users_by_channel[channel_id].append(user_id)
+
+        semaphore = asyncio.Semaphore(self.announce_concurrency)
+        await asyncio.gather(*(
+            self._announce_birthdays(semaphore, channel_id, user_ids)
+            for channel_id, user_ids in users_by_channel.items()
+        ))
+        await self.birthday_store.set_meta(self.last_announced_key, date.isoformat())
+
+    async def _announce_birthdays(self, semaphore, channel_id, user_ids):
+        async with semaphore:
+            channel = await self.bot.get_or_fetch_channel(channel_id)
+            if channel is None:
+                return
+
+            # Skip people who have left the server since setting their birthday.
+            guild = getattr(channel, "guild", None)
+            if guild is not None:
+                members = await asyncio.gather(*(self.bot.get_or_fetch_member(guild, user_id)
+                                                 for user_id in user_ids))
+                user_ids = [member.id for member in members if member is not None]
+
+            for i in range(0, len(user_ids), BIRTHDAY_MENTIONS_PER_MESSAGE):
+                mentions = ", ".join(f"<@{user_id}>" for user_id in user_ids[i:i + BIRTHDAY_MENTIONS_PER_MESSAGE])
+                try:
+                    await channel.send(f"🎂 Happy Birthday, {mentions}! 🎉")
+                except discord.HTTPException as e:
+                    logger.error(f"Failed to send birthday message to channel {channel_id}: {e}")
+                    return
+
+    @commands.hybrid_command(name="fact", description="Get a random fact")
     async def daily_fact(self, ctx):
-        async with self.session.get("https://uselessfacts.jsph.pl/api/v2/facts/random") as response:
-            if response.status == 200:
-                data = await response.json()
-                fact = data["text"]
-                await ctx.send(f"📚 **Random Fact:** {fact}")
-            else:
-                await ctx.send("Failed to fetch a fact. Try again later.")
+        await ctx.typing()
+        data = await self.api_client.get("https://uselessfacts.jsph.pl/api/v2/facts/random")
+        if data:
+            fact = data["text"]
+            await ctx.send(f"📚 **Random Fact:** {fact}")
+        else:
+            await ctx.send("Failed to fetch a fact. Try again later.")
 
-    @commands.command(name="today")
+    @commands.hybrid_command(name="today", description="Something that happened on this day in history")
     async def this_day_in_history(self, ctx):
+        await ctx.typing()
         today = datetime.datetime.now()
         month, day = today.month, today.day
 
-        async with self.session.get(f"https://byabbe.se/on-this-day/{month}/{day}/events.json") as response:
-            if response.status == 200:
-                data = await response.json()
-                events = data.get("events", [])
-
-                if events:
-                    event = rd.choice(events)
-                    year = event["year"]
-                    description = event["description"]
-
-                    embed = discord.Embed(
-                        title=f"This Day in History: {month}/{day}",
-                        description=f"**{year}**: {description}",
-                        color=discord.Color.gold()
-                    )
-                    await ctx.send(embed=embed)
-                else:
-                    await ctx.send(f"No historical events found for {month}/{day}.")
+        data = await self.api_client.get(f"https://byabbe.se/on-this-day/{month}/{day}/events.json",
+                                         projection=ON_THIS_DAY_PROJECTION)
+        if data is not None:
+            events = data.get("events", [])
+
+            if events:
+                event = rd.choice(events)
+                year = event["year"]
+                description = event["description"]
+
+                embed = discord.Embed(
+                    title=f"This Day in History: {month}/{day}",
+                    description=f"**{year}**: {description}",
+                    color=discord.Color.gold()
+                )
+                await ctx.send(embed=embed)
             else:
-                await ctx.send("Failed to fetch historical events. Try again later.")
+                await ctx.send(f"No historical events found for {month}/{day}.")
+        else:
+            await ctx.send("Failed to fetch historical events. Try again later.")
 
-    @commands.command(name="music")
+    @commands.hybrid_command(name="music")
+    @app_commands.describe(genre="Genre to pick from (random if empty)")
     async def music_recommendation(self, ctx, genre: str = None):
         """Get a music recommendation, optionally by genre"""
+        await ctx.typing()
         try:
-            auth_response = await self.session.post(
-                'https://accounts.spotify.com/api/token',
-                data={'grant_type': 'client_credentials'},
-                headers={'Authorization': f'Basic {os.getenv("SPOTIFY_AUTH")}'}
-            )
-
-            auth_data = await auth_response.json()
-            access_token = auth_data['access_token']
-            headers = {'Authorization': f'Bearer {access_token}'}
-
             if not genre:
-                genres_response = await self.session.get(
-                    'https://api.spotify.com/v1/recommendations/available-genre-seeds',
-                    headers=headers
-                )
-
-                genres_data = await genres_response.json()
-                available_genres = genres_data.get('genres', [])
+                available_genres = await self.spotify.genres()
 
                 if available_genres:
                     genre = rd.choice(available_genres)
@@ -112,45 +165,28 @@ class Utility(commands.Cog):
                     basic_genres = ["rock", "pop", "hip-hop", "jazz", "classical", "electronic", "country"]
                     genre = rd.choice(basic_genres)
 
-            params = {
-                'q': f'genre:"{genre}"',
-                'type': 'track',
-                'limit': 20,
-                'market': 'US'
-            }
-
-            search_response = await self.session.get(
-                'https://api.spotify.com/v1/search',
-                params=params,
-                headers=headers
-            )
-
-            search_data = await search_response.json()
-
-            if search_response.status == 200 and search_data['tracks']['items']:
-                track = rd.choice(search_data['tracks']['items'])
-                artist = track['artists'][0]['name']
-                title = track['name']
-                track_url = track['external_urls']['spotify']
+            track = await self.spotify.recommend(genre)
 
+            if track:
                 embed = discord.Embed(
                     title=f"Music Recommendation ({genre})",
-                    description=f"**{title}** by {artist}\n[Listen on Spotify]({track_url})",
+                    description=f"**{track.title}** by {track.artist}\n[Listen on Spotify]({track.url})",
                     color=discord.Color.green()
                 )
 
-                if track['album']['images']:
-                    embed.set_thumbnail(url=track['album']['images'][0]['url'])
+                if track.image:
+                    embed.set_thumbnail(url=track.image)
 
                 await ctx.send(embed=embed)
             else:
                 await self._fallback_recommendation(ctx, genre)
 
         except Exception as e:
-            print(f"Error accessing Spotify API: {e}")
+            logger.error(f"Error accessing Spotify API: {e}")
             await self._fallback_recommendation(ctx, genre)
 
     async def _fallback_recommendation(self, ctx, genre):
+        FALLBACKS.inc(feature="music")
         recommendations = {
             "rock": ["Led Zeppelin - Stairway to Heaven", "Queen - Bohemian Rhapsody"],
             "pop": ["Michael Jackson - Thriller", "Taylor Swift - Blank Space"],
@@ -0,0 +1,143 @@
+"""Run the bot in one of three modes.
+
+``single``     one gateway connection in this process (same as ``bot.py``)
+``auto``       every shard in this process via ``AutoShardedBot``
+``processes``  shards split into contiguous ranges over N worker processes,
+               restarted by a supervisor when they crash
+
+Example: ``PYTHONPATH=. python src/launcher.py --mode processes --workers 4``. Use
+``STATE_BACKEND=sqlite`` in multi-process mode so cross-shard state is shared.
+"""
+import os
+import time
+import asyncio
+import logging
+import argparse
+import multiprocessing
+import aiohttp
+from src.bot import Bot, ShardedBot, TOKEN, run
+
+logger = logging.getLogger(__name__)
+
+GATEWAY_BOT_URL = "https://discord.com/api/v10/gateway/bot"
+
+
+def shard_ranges(shard_count, workers):
+    """Split ``range(shard_count)`` into ``workers`` contiguous, near-equal chunks."""
+    workers = max(1, min(workers, shard_count))
+    base, extra = divmod(shard_count, workers)
+    ranges, start = [], 0
+    for i in range(workers):
+        size = base + (1 if i < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+async def recommended_shard_count(token):
+    async with aiohttp.ClientSession() as session:
+        async with session.get(GATEWAY_BOT_URL, headers={"Authorization": f"Bot {token}"}) as response:
+            response.raise_for_status()
+            data = await response.json()
+            return data["shards"]
+
+
+async def run_bot(bot):
+    async with bot:
+        await bot.start(TOKEN)
+
+
+def run_worker(shard_ids, shard_count, worker_id):
+    os.environ["BOTZILLA_WORKER_ID"] = str(worker_id)
+    run(run_bot(ShardedBot(shard_ids=shard_ids, shard_count=shard_count)))
+
+
+class Supervisor:
+    """Keeps one worker process per shard range alive, restarting crashed workers with backoff.
+
+    The backoff for a worker starts over once it has stayed up for ``healthy_after`` seconds.
+    """
+
+    def __init__(self, ranges, shard_count, stagger=5.0, max_backoff=300.0, healthy_after=600.0):
+        self.ranges = ranges
+        self.shard_count = shard_count
+        self.stagger = stagger
+        self.max_backoff = max_backoff
+        self.healthy_after = healthy_after
+        self.processes = {}
+        self.started_at = {}
+        self.restarts = {}
+        self.pending = {}
+
+    def start_worker(self, worker_id):
+        shard_ids = self.ranges[worker_id]
+        process = multiprocessing.Process(target=run_worker, args=(shard_ids, self.shard_count, worker_id),
+                                          name=f"botzilla-shards-{shard_ids[0]}-{shard_ids[-1]}")
+        process.start()
+        self.processes[worker_id] = process
+        self.started_at[worker_id] = time.monotonic()
+        logger.info(f"Started worker {worker_id} (pid {process.pid}) for shards {shard_ids[0]}-{shard_ids[-1]}")
+
+    def run(self):
+        for worker_id in range(len(self.ranges)):
+            self.start_worker(worker_id)
+            # Identify requests are rate limited per bot; don't let workers race each other.
+            time.sleep(self.stagger * len(self.ranges[worker_id]))
+
+        try:
+            while True:
+                self.check_workers(time.monotonic())
+                time.sleep(1)
+        except KeyboardInterrupt:
+            logger.info("Shutting down workers")
+        finally:
+            for process in self.processes.values():
+                process.terminate()
+            for process in self.processes.values():
+                process.join(timeout=10)
+
+    def check_workers(self, now):
+        """Schedule restarts for workers that have exited and start those that are due."""
+        for worker_id, process in list(self.processes.items()):
+            if worker_id in self.pending:
+                continue
+            if process.is_alive():
+                if self.restarts.get(worker_id) and now - self.started_at[worker_id] >= self.healthy_after:
+                    del self.restarts[worker_id]
+                continue
+            restarts = self.restarts.get(worker_id, 0)
+            delay = min(self.max_backoff, self.stagger * 2 ** restarts)
+            logger.error(f"Worker {worker_id} exited with code {process.exitcode}, restarting in {delay:.0f}s")
+            self.pending[worker_id] = now + delay
+
+        for worker_id, restart_at in list(self.pending.items()):
+            if now >= restart_at:
+                del self.pending[worker_id]
+                self.restarts[worker_id] = self.restarts.get(worker_id, 0) + 1
+                self.start_worker(worker_id)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Botzilla launcher")
+    parser.add_argument("--mode", choices=("single", "auto", "processes"), default="single")
+    parser.add_argument("--shard-count", type=int, default=None,
+                        help="total shards (default: Discord's recommendation)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes in 'processes' mode")
+    parser.add_argument("--stagger", type=float, default=5.0,
+                        help="seconds to wait per shard before starting the next worker")
+    args = parser.parse_args(argv)
+
+    if args.mode == "single":
+        run(run_bot(Bot()))
+    elif args.mode == "auto":
+        run(run_bot(ShardedBot(shard_count=args.shard_count)))
+    else:
+        shard_count = args.shard_count or asyncio.run(recommended_shard_count(TOKEN))
+        ranges = shard_ranges(shard_count, args.workers)
+        logger.info(f"Running {shard_count} shard(s) over {len(ranges)} worker process(es)")
+        Supervisor(ranges, shard_count, stagger=args.stagger).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+import os
+import json
+import asyncio
+import logging
+from collections import deque
+from src.utils.storage import data_path, load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+BATCH_PROMPT = (
+    "Generate {count} different short adventure scenarios. Each scenario is under 80 words and offers exactly "
+    "three choices, and each choice has a one or two sentence outcome. Reply with JSON only: "
+    '{{"adventures": [{{"scenario": "...", "choices": ["...", "...", "..."], "outcomes": ["...", "...", "..."]}}]}}'
+)
+
+
+def parse_scenarios(text):
+    """Return the well-formed scenarios from a batch completion, dropping any that are malformed."""
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return []
+
+    if isinstance(data, dict):
+        data = data.get("adventures", [])
+    if not isinstance(data, list):
+        return []
+
+    scenarios = []
+    for entry in data:
+        if not isinstance(entry, dict):
+            continue
+        scenario, choices, outcomes = entry.get("scenario"), entry.get("choices"), entry.get("outcomes")
+        if (isinstance(scenario, str) and scenario.strip() and isinstance(choices, list) and len(choices) == 3
+                and isinstance(outcomes, list) and len(outcomes) == 3
+                and all(isinstance(t, str) and t.strip() for t in choices + outcomes)):
+            scenarios.append({"scenario": scenario.strip(), "choices": [c.strip() for c in choices],
+                              "outcomes": [o.strip() for o in outcomes]})
+    return scenarios
+
+
+class AdventurePool:
+    """Bounded pool of pre-generated adventures, each with three choices and their outcomes.
+
+    ``take`` never waits on the LLM: it returns ``None`` when the pool is
+    empty so the caller can fall back to a live request. Refills run in the
+    background in batches of ``batch_size`` whenever the pool drops below
+    ``low_watermark``, and hold off while adventures are being played so
+    generation happens in idle periods.
+    """
+
+    def __init__(self, generate, path=None, low_watermark=5, high_watermark=30, batch_size=5,
+                 idle_delay=30.0, min_interval=10.0):
+        self.generate = generate
+        if path is None:
+            worker_id = os.getenv("BOTZILLA_WORKER_ID")
+            path = data_path(f"adventure_pool-{worker_id}.json" if worker_id else "adventure_pool.json")
+        self.path = path
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.batch_size = batch_size
+        self.idle_delay = idle_delay
+        self.min_interval = min_interval
+        self._pool = deque(maxlen=high_watermark)
+        self._refill_task = None
+        self._last_take = None
+
+    def size(self):
+        return len(self._pool)
+
+    def take(self):
+        """Pop a pre-generated adventure, or return ``None`` if none are ready."""
+        self._last_take = asyncio.get_running_loop().time()
+        adventure = self._pool.popleft() if self._pool else None
+        if len(self._pool) < self.low_watermark:
+            self.schedule_refill()
+        return adventure
+
+    def schedule_refill(self):
+        if self._refill_task is not None:
+            return
+
+        self._refill_task = asyncio.create_task(self._refill())
+        self._refill_task.add_done_callback(self._refill_done)
+
+    def _refill_done(self, task):
+        self._refill_task = None
+
+    async def _refill(self):
+        try:
+            while len(self._pool) < self.high_watermark:
+                await self._wait_for_idle()
+                batch = await self.generate(min(self.batch_size, self.high_watermark - len(self._pool)))
+                if not batch:
+                    break
+                self._pool.extend(batch)
+                logger.info(f"Adventure pool refilled to {len(self._pool)}")
+                self.save()
+                if len(self._pool) < self.high_watermark:
+                    await asyncio.sleep(self.min_interval)
+        except Exception as e:
+            logger.error(f"Adventure pool refill failed: {e}")
+
+    async def _wait_for_idle(self):
+        # An empty pool is refilled straight away; otherwise wait for a quiet spell.
+        loop = asyncio.get_running_loop()
+        while self._pool and self._last_take is not None:
+            delay = self._last_take + self.idle_delay - loop.time()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    def load(self):
+        data = load_json(self.path)
+        if data:
+            self._pool.extend(data.get("adventures", []))
+
+    def save(self):
+        try:
+            save_json(self.path, {"adventures": list(self._pool)})
+        except OSError as e:
+            logger.error(f"Failed to save adventure pool: {e}")
+
+    async def close(self):
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            self._refill_task = None
+        self.save()
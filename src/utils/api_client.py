@@ -1,25 +1,250 @@
+import os
+import time
+import asyncio
 import aiohttp
 import logging
+from urllib.parse import urlencode, urlsplit
+from src.utils.cache import CachePolicy, ResponseCache
+from src.utils.json_decoding import decode_json, encoded_size
+from src.utils.metrics import CACHE_LOOKUPS, UPSTREAM_LATENCY, UPSTREAM_TIMEOUTS
+from src.utils.ratelimit import RateLimits, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CACHE_POLICIES = [
+    # "On this day" events: the URL already contains the date, so a day is safe.
+    CachePolicy(r"https://byabbe\.se/on-this-day/", ttl=24 * 3600, stale_ttl=3600),
+    CachePolicy(r"https://api\.spotify\.com/v1/recommendations/available-genre-seeds", ttl=24 * 3600,
+                stale_ttl=24 * 3600),
+]
+
+
+def request_key(url, params=None):
+    """Default request key: the URL plus its query parameters in sorted order."""
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()))}"
+
 
 class ApiClient:
-    def __init__(self, session=None):
-        self.session = session or aiohttp.ClientSession()
+    """Shared HTTP client used by every cog.
+
+    One instance is created by the bot in ``setup_hook`` so that all cogs share a
+    single connection pool (keep-alive, DNS cache and per-host limits). GET
+    requests matching a cache policy are served from an in-process response
+    cache, with stale entries refreshed in the background. Concurrent identical
+    GET requests (as identified by ``key_func``) share a single upstream call.
+
+    Every request goes through a per-host token bucket and circuit breaker;
+    429s and transient failures are retried with jittered backoff that honours
+    ``Retry-After``. While a host's circuit is open requests fail fast and
+    return None so cogs drop straight to their fallbacks.
+    """
+
+    def __init__(self, session=None, limit=100, limit_per_host=10, ttl_dns_cache=300,
+                 keepalive_timeout=30, timeout=10, connect_timeout=5, cache=None,
+                 cache_policies=None, key_func=request_key, rate_limits=None, decoder=decode_json):
+        self._session = session
+        self._connector_options = {
+            "limit": limit,
+            "limit_per_host": limit_per_host,
+            "ttl_dns_cache": ttl_dns_cache,
+            "keepalive_timeout": keepalive_timeout
+        }
+        self._timeout = aiohttp.ClientTimeout(total=timeout, connect=connect_timeout)
+        self.cache = cache if cache is not None else ResponseCache()
+        self.cache_policies = DEFAULT_CACHE_POLICIES if cache_policies is None else cache_policies
+        self.key_func = key_func
+        self.rate_limits = rate_limits if rate_limits is not None else RateLimits()
+        self.decoder = decoder
+        self.requests = 0
+        self.coalesced = 0
+        self._refresh_tasks = {}
+        self._inflight = {}
+
+    @property
+    def session(self):
+        # Created on first use so that it is bound to the running event loop.
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(**self._connector_options),
+                timeout=self._timeout
+            )
+        return self._session
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            limit=int(os.getenv("HTTP_POOL_LIMIT", 100)),
+            limit_per_host=int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", 10)),
+            ttl_dns_cache=int(os.getenv("HTTP_DNS_TTL", 300)),
+            keepalive_timeout=float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", 30)),
+            timeout=float(os.getenv("HTTP_TIMEOUT", 10)),
+            connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT", 5)),
+            cache=ResponseCache(max_bytes=int(os.getenv("HTTP_CACHE_MAX_BYTES", 8 * 1024 * 1024))),
+            rate_limits=RateLimits.from_file()
+        )
 
     async def close(self):
-        if self.session:
-            await self.session.close()
+        for task in list(self._refresh_tasks.values()):
+            task.cancel()
+        self._refresh_tasks.clear()
+
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def get(self, url, params=None, headers=None, projection=None):
+        """GET ``url`` as decoded JSON, or None on failure.
+
+        ``projection`` (a ``Projection``) trims the document to the fields the
+        caller needs before it is returned or cached.
+        """
+        policy = self._cache_policy(url)
+        if policy is None:
+            data, _ = await self._get_coalesced(url, params, headers)
+            return projection(data) if projection is not None and data is not None else data
+
+        key = self.key_func(url, params)
+        if projection is not None:
+            key = f"{key}#{projection.key}"
+        entry = self.cache.get(key)
+        if entry is not None:
+            if not entry.is_fresh(self.cache.clock()):
+                CACHE_LOOKUPS.inc(result="stale")
+                self._refresh_in_background(key, policy, url, params, headers, projection)
+            else:
+                CACHE_LOOKUPS.inc(result="hit")
+            return entry.value
+
+        CACHE_LOOKUPS.inc(result="miss")
+
+        return await self._fetch_into_cache(key, policy, url, params, headers, projection)
+
+    async def post(self, url, data=None, headers=None):
+        result, _ = await self._request("POST", url, data=data, headers=headers)
+        return result
+
+    def _cache_policy(self, url):
+        for policy in self.cache_policies:
+            if policy.matches(url):
+                return policy
+        return None
 
-    async def get(self, url, params=None, headers=None):
+    def is_available(self, host):
+        """Whether requests to ``host`` are currently allowed by its circuit breaker."""
+        return self.rate_limits.for_host(host).breaker.is_available()
+
+    def record_success(self, host):
+        self.rate_limits.for_host(host).breaker.record_success()
+
+    def record_failure(self, host):
+        self.rate_limits.for_host(host).breaker.record_failure()
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+            "cache_hits": self.cache.hits,
+            "cache_stale_hits": self.cache.stale_hits,
+            "cache_misses": self.cache.misses,
+            "cache_bytes": self.cache.size
+        }
+
+    async def _get_coalesced(self, url, params, headers):
+        key = self.key_func(url, params)
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(self._request("GET", url, params=params, headers=headers))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shielded so that one cancelled caller does not cancel the request for everyone else.
+        return await asyncio.shield(task)
+
+    async def _fetch_into_cache(self, key, policy, url, params, headers, projection=None):
+        data, size = await self._get_coalesced(url, params, headers)
+        if data is not None:
+            if projection is not None:
+                data = projection(data)
+                size = encoded_size(data)
+            self.cache.set(key, data, size, policy.ttl, policy.stale_ttl)
+        return data
+
+    def _refresh_in_background(self, key, policy, url, params, headers, projection=None):
+        if key in self._refresh_tasks:
+            return
+
+        task = asyncio.create_task(self._fetch_into_cache(key, policy, url, params, headers, projection))
+        self._refresh_tasks[key] = task
+        task.add_done_callback(lambda _: self._refresh_tasks.pop(key, None))
+
+    async def _request(self, method, url, params=None, data=None, headers=None):
+        """Perform a request and return ``(decoded_json, body_size)``; ``(None, 0)`` on failure."""
+        limiter = self.rate_limits.for_host(urlsplit(url).hostname)
+        breaker = limiter.breaker
+
+        # A half-open breaker lets exactly one trial request through. Anything short of a success
+        # (a 429, a paused bucket, an unexpected error, cancellation) has to re-open it, or it
+        # would refuse every later request for good.
+        trial = False
         try:
-            async with self.session.get(url, params=params, headers=headers) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    logger.error(f"API request failed: {response.status} - {await response.text()}")
-                    return None
-        except Exception as e:
-            logger.error(f"API request error: {e}")
-            return None
\ No newline at end of file
+            for attempt in range(limiter.max_retries + 1):
+                if not breaker.allow():
+                    logger.warning(f"Circuit open for {limiter.host}, skipping request to {url}")
+                    return None, 0
+                if breaker.state == breaker.HALF_OPEN:
+                    trial = True
+
+                if not await limiter.bucket.acquire(limiter.max_wait):
+                    logger.warning(f"Rate limit for {limiter.host} exceeded, skipping request to {url}")
+                    return None, 0
+
+                self.requests += 1
+                retry_after = None
+                status = "error"
+                started = time.perf_counter()
+                try:
+                    async with self.session.request(method, url, params=params, data=data,
+                                                    headers=headers) as response:
+                        status = str(response.status)
+                        if response.status == 200:
+                            body = await response.read()
+                            breaker.record_success()
+                            return self.decoder(body), len(body)
+
+                        logger.error(f"API request failed: {response.status} - {await response.text()}")
+                        if response.status == 429:
+                            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                            limiter.bucket.pause(retry_after if retry_after is not None else limiter.backoff_base)
+                        elif response.status >= 500:
+                            breaker.record_failure()
+                        else:
+                            # Client errors mean the host is up; retrying will not help.
+                            breaker.record_success()
+                            return None, 0
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    logger.error(f"API request error: {e!r}")
+                    if isinstance(e, asyncio.TimeoutError):
+                        status = "timeout"
+                        UPSTREAM_TIMEOUTS.inc(host=limiter.host)
+                    breaker.record_failure()
+                except Exception as e:
+                    logger.error(f"API request error: {e}")
+                    return None, 0
+                finally:
+                    UPSTREAM_LATENCY.observe(time.perf_counter() - started, host=limiter.host, status=status)
+
+                if attempt < limiter.max_retries:
+                    delay = limiter.retry_delay(attempt, retry_after)
+                    if delay > limiter.max_wait:
+                        logger.warning(f"Not retrying {url}: would wait {delay:.1f}s")
+                        return None, 0
+                    await asyncio.sleep(delay)
+
+            return None, 0
+        finally:
+            if trial and breaker.state == breaker.HALF_OPEN:
+                breaker.record_failure()
@@ -0,0 +1,75 @@
+import asyncio
+import calendar
+import sqlite3
+import threading
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS birthdays (
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    channel_id INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+);
+CREATE INDEX IF NOT EXISTS birthdays_by_day ON birthdays (month, day);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class BirthdayStore:
+    """SQLite-backed birthday registry indexed by (month, day).
+
+    Queries run in a worker thread so the event loop never blocks on disk.
+    """
+
+    def __init__(self, path):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            # WAL lets shard worker processes read while another one writes.
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    async def set(self, guild_id, user_id, channel_id, month, day):
+        await self._run(
+            "INSERT OR REPLACE INTO birthdays (guild_id, user_id, channel_id, month, day) VALUES (?, ?, ?, ?, ?)",
+            (guild_id, user_id, channel_id, month, day))
+
+    async def remove(self, guild_id, user_id):
+        await self._run("DELETE FROM birthdays WHERE guild_id = ? AND user_id = ?", (guild_id, user_id))
+
+    async def for_date(self, date):
+        """Return ``(guild_id, user_id, channel_id)`` rows for everyone whose birthday is on ``date``.
+
+        Feb 29 birthdays are celebrated on Feb 28 in non-leap years.
+        """
+        if date.month == 2 and date.day == 28 and not calendar.isleap(date.year):
+            query = "SELECT guild_id, user_id, channel_id FROM birthdays WHERE month = 2 AND day IN (28, 29)"
+            return await self._run(query, ())
+        return await self._run("SELECT guild_id, user_id, channel_id FROM birthdays WHERE month = ? AND day = ?",
+                               (date.month, date.day))
+
+    async def get_meta(self, key):
+        rows = await self._run("SELECT value FROM meta WHERE key = ?", (key,))
+        return rows[0][0] if rows else None
+
+    async def set_meta(self, key, value):
+        await self._run("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    async def _run(self, query, params):
+        return await asyncio.to_thread(self._execute, query, params)
+
+    def _execute(self, query, params):
+        with self._lock, self._conn:
+            return self._conn.execute(query, params).fetchall()
@@ -0,0 +1,95 @@
+import re
+import time
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class CachePolicy:
+    """TTL policy for every URL matching ``pattern``.
+
+    Entries are fresh for ``ttl`` seconds and may then be served for another
+    ``stale_ttl`` seconds while a refresh runs in the background.
+    """
+
+    def __init__(self, pattern, ttl, stale_ttl=0):
+        self.pattern = re.compile(pattern)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+    def matches(self, url):
+        return self.pattern.match(url) is not None
+
+
+class CacheEntry:
+    __slots__ = ("value", "size", "expires_at", "stale_until")
+
+    def __init__(self, value, size, expires_at, stale_until):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+    def is_fresh(self, now):
+        return now < self.expires_at
+
+
+class ResponseCache:
+    """In-process LRU cache of decoded responses, bounded by payload size in bytes."""
+
+    def __init__(self, max_bytes=8 * 1024 * 1024, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.size = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        now = self.clock()
+
+        if entry is None or now >= entry.stale_until:
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        if entry.is_fresh(now):
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return entry
+
+    def set(self, key, value, size, ttl, stale_ttl=0):
+        if size > self.max_bytes:
+            logger.debug(f"Not caching {key}: {size} bytes exceeds cache size")
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        now = self.clock()
+        self._entries[key] = CacheEntry(value, size, now + ttl, now + ttl + stale_ttl)
+        self.size += size
+
+        while self.size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.size -= entry.size
@@ -0,0 +1,32 @@
+import random as rd
+
+# Code points with default emoji presentation (Unicode Emoji_Presentation=Yes, up to
+# Unicode 14) inside the blocks !fireworks draws from. Text-presentation symbols, skin
+# tone modifiers and unassigned code points are left out because Discord rejects them
+# as reactions.
+EMOJI_RANGES = (
+    # Misc symbols
+    (0x2614, 0x2615), (0x2648, 0x2653), (0x267F, 0x267F), (0x2693, 0x2693), (0x26A1, 0x26A1),
+    (0x26AA, 0x26AB), (0x26BD, 0x26BE), (0x26C4, 0x26C5), (0x26CE, 0x26CE), (0x26D4, 0x26D4),
+    (0x26EA, 0x26EA), (0x26F2, 0x26F3), (0x26F5, 0x26F5), (0x26FA, 0x26FA), (0x26FD, 0x26FD),
+    # Misc symbols and pictographs
+    (0x1F300, 0x1F320), (0x1F32D, 0x1F335), (0x1F337, 0x1F37C), (0x1F37E, 0x1F393),
+    (0x1F3A0, 0x1F3CA), (0x1F3CF, 0x1F3D3), (0x1F3E0, 0x1F3F0), (0x1F3F4, 0x1F3F4),
+    (0x1F3F8, 0x1F3FA), (0x1F400, 0x1F43E), (0x1F440, 0x1F440), (0x1F442, 0x1F4FC),
+    (0x1F4FF, 0x1F53D), (0x1F54B, 0x1F54E), (0x1F550, 0x1F567), (0x1F57A, 0x1F57A),
+    (0x1F595, 0x1F596), (0x1F5A4, 0x1F5A4), (0x1F5FB, 0x1F5FF),
+    # Emoticons
+    (0x1F600, 0x1F64F),
+    # Transport and map
+    (0x1F680, 0x1F6C5), (0x1F6CC, 0x1F6CC), (0x1F6D0, 0x1F6D2), (0x1F6D5, 0x1F6D7),
+    (0x1F6EB, 0x1F6EC), (0x1F6F4, 0x1F6FC),
+)
+
+# Every emoji is a single code point, so one str is both compact and O(1) to index.
+EMOJI_TABLE = "".join(chr(codepoint) for start, end in EMOJI_RANGES for codepoint in range(start, end + 1))
+
+
+def sample_emojis(k):
+    """Return ``k`` distinct random emoji from the table in O(k)."""
+    k = min(k, len(EMOJI_TABLE))
+    return [EMOJI_TABLE[i] for i in rd.sample(range(len(EMOJI_TABLE)), k)]
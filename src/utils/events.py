@@ -0,0 +1,67 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class EventRouter:
+    """Routes gateway events to waiting games by channel or message id.
+
+    Unlike ``Bot.wait_for``, which runs every pending check against every event,
+    waiters are indexed by the id they care about: a message is only checked
+    against waiters in its channel and a reaction only against waiters on its
+    message, so events in idle channels cost a single dict lookup.
+
+    Reactions are taken from ``raw_reaction_add`` so they arrive even when the
+    message is not in the (possibly disabled) message cache.
+    """
+
+    def __init__(self):
+        self._message_waiters = {}
+        self._reaction_waiters = {}
+
+    def dispatch(self, event_name, *args):
+        if event_name == "message":
+            self._resolve(self._message_waiters, args[0].channel.id, args, args[0])
+        elif event_name == "raw_reaction_add":
+            self._resolve(self._reaction_waiters, args[0].message_id, args, args[0])
+
+    async def wait_for_message(self, channel_id, check=None, timeout=None):
+        """Wait for a message in ``channel_id``; raises ``asyncio.TimeoutError`` like ``Bot.wait_for``."""
+        return await self._wait(self._message_waiters, channel_id, check, timeout)
+
+    async def wait_for_reaction(self, message_id, check=None, timeout=None):
+        """Wait for a reaction on ``message_id`` and return its ``RawReactionActionEvent``."""
+        return await self._wait(self._reaction_waiters, message_id, check, timeout)
+
+    def waiting(self):
+        return sum(map(len, self._message_waiters.values())) + sum(map(len, self._reaction_waiters.values()))
+
+    async def _wait(self, index, key, check, timeout):
+        future = asyncio.get_running_loop().create_future()
+        waiter = (future, check)
+        index.setdefault(key, []).append(waiter)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            waiters = index.get(key)
+            if waiters is not None:
+                if waiter in waiters:
+                    waiters.remove(waiter)
+                if not waiters:
+                    del index[key]
+
+    @staticmethod
+    def _resolve(index, key, args, result):
+        waiters = index.get(key)
+        if not waiters:
+            return
+
+        for future, check in list(waiters):
+            if future.done():
+                continue
+            try:
+                if check is None or check(*args):
+                    future.set_result(result)
+            except Exception as e:
+                future.set_exception(e)
@@ -0,0 +1,127 @@
+import time
+import asyncio
+import logging
+import random as rd
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query):
+    """Map case and whitespace variants of a search (``" Funny  CATS"``, ``"funny cats"``) to one key."""
+    return " ".join(query.casefold().split())
+
+
+class GifResults:
+    """The unused URLs of one query, plus where the next page starts."""
+
+    __slots__ = ("urls", "offset", "total", "expires_at")
+
+    def __init__(self, expires_at):
+        self.urls = []
+        self.offset = 0
+        self.total = None
+        self.expires_at = expires_at
+
+
+class GifPool:
+    """Per-query pools of GIF URLs, so one search serves many requests.
+
+    ``take`` hands out a random unused URL for the query and only calls
+    ``fetch(query, offset)`` when that query's pool has run dry, paging on
+    through the results with ``offset``. ``fetch`` returns ``(urls,
+    total_count)`` or ``None`` on failure. A query's URLs expire ``ttl``
+    seconds after its last page was fetched, and the least recently used
+    queries are evicted once more than ``max_urls`` URLs or ``max_queries``
+    queries are held.
+    """
+
+    def __init__(self, fetch, ttl=600.0, max_urls=5000, max_queries=500, max_offset=4999, clock=time.monotonic):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.max_urls = max_urls
+        self.max_queries = max_queries
+        self.max_offset = max_offset
+        self.clock = clock
+        self.size = 0
+        self._pools = OrderedDict()
+        self._fetches = {}
+
+    def __len__(self):
+        return len(self._pools)
+
+    def no_results(self, query):
+        """Whether the last search for ``query`` found nothing at all."""
+        entry = self._live_entry(normalize_query(query))
+        return entry is not None and entry.total == 0
+
+    async def take(self, query):
+        """Return an unused URL for ``query``, or ``None`` if there are no results or the fetch failed."""
+        key = normalize_query(query)
+        entry = self._live_entry(key)
+        if entry is None or not entry.urls:
+            entry = await self._fill(key)
+            if entry is None or not entry.urls:
+                return None
+
+        urls = entry.urls
+        i = rd.randrange(len(urls))
+        urls[i], urls[-1] = urls[-1], urls[i]
+        url = urls.pop()
+        # Another query's fetch may have evicted this one while we waited; its size is already accounted for.
+        if self._pools.get(key) is entry:
+            self._pools.move_to_end(key)
+            self.size -= 1
+        return url
+
+    def _live_entry(self, key):
+        entry = self._pools.get(key)
+        if entry is not None and self.clock() >= entry.expires_at:
+            self._discard(key)
+            return None
+        return entry
+
+    def _discard(self, key):
+        entry = self._pools.pop(key)
+        self.size -= len(entry.urls)
+
+    async def _fill(self, key):
+        # Concurrent requests for a dry query share one fetch.
+        task = self._fetches.get(key)
+        if task is None:
+            task = self._fetches[key] = asyncio.create_task(self._fetch_page(key))
+            task.add_done_callback(lambda _: self._fetches.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch_page(self, key):
+        entry = self._pools.get(key)
+        offset = entry.offset if entry is not None else 0
+
+        result = await self.fetch(key, offset)
+        if result is not None and not result[0] and offset:
+            # Ran off the end of the results (or they shrank): start over from the first page.
+            offset = 0
+            result = await self.fetch(key, offset)
+        if result is None:
+            return None
+
+        urls, total = result
+        entry = self._pools.get(key)
+        if entry is None:
+            entry = self._pools[key] = GifResults(0)
+        entry.urls.extend(urls)
+        entry.total = total
+        entry.offset = offset + len(urls)
+        if not urls or entry.offset >= min(total, self.max_offset):
+            entry.offset = 0
+        entry.expires_at = self.clock() + self.ttl
+        self.size += len(urls)
+        self._pools.move_to_end(key)
+        self._evict()
+        logger.debug(f"Fetched {len(urls)} GIFs for {key!r} at offset {offset}")
+        return entry
+
+    def _evict(self):
+        while len(self._pools) > 1 and (self.size > self.max_urls or len(self._pools) > self.max_queries):
+            key = next(iter(self._pools))
+            self._discard(key)
@@ -0,0 +1,65 @@
+"""JSON decoding for upstream responses.
+
+``decode_json`` parses raw response bytes with orjson when it is installed and
+falls back to the standard library otherwise; neither needs the body decoded
+to ``str`` first. ``Projection`` trims a decoded payload down to the fields a
+command reads, so cached responses do not hold on to everything else.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def decode_json(body):
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def encoded_size(value):
+    """Approximate in-cache size of ``value``: the length of its compact JSON encoding."""
+    if orjson is not None:
+        return len(orjson.dumps(value))
+    return len(json.dumps(value, separators=(",", ":")))
+
+
+class Projection:
+    """Keep only the given dotted paths of a JSON document.
+
+    Lists are walked transparently, so ``Projection("data.images.original.url")``
+    turns a Giphy search response into
+    ``{"data": [{"images": {"original": {"url": ...}}}, ...]}``.
+    """
+
+    __slots__ = ("paths", "key", "_tree")
+
+    def __init__(self, *paths):
+        self.paths = paths
+        self.key = "|".join(sorted(paths))
+        self._tree = {}
+        for path in paths:
+            node = self._tree
+            *parents, leaf = path.split(".")
+            for name in parents:
+                node = node.setdefault(name, {})
+                if node is None:
+                    break
+            else:
+                # A leaf keeps its whole subtree, even if a longer path asked for part of it.
+                node[leaf] = None
+
+    def __call__(self, value):
+        return self._apply(value, self._tree)
+
+    @classmethod
+    def _apply(cls, value, tree):
+        if tree is None:
+            return value
+        if isinstance(value, list):
+            return [cls._apply(item, tree) for item in value]
+        if isinstance(value, dict):
+            return {name: cls._apply(value[name], subtree) for name, subtree in tree.items() if name in value}
+        return value
@@ -0,0 +1,175 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Metrics are module-level objects so any layer can record into them without
+plumbing; ``MetricsServer`` serves ``REGISTRY`` over HTTP. Labels are passed as
+keyword arguments, e.g. ``UPSTREAM_LATENCY.observe(0.12, host="opentdb.com", status="200")``.
+"""
+import math
+import logging
+from bisect import bisect_left
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in labels.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
+
+def _format_value(value):
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name, documentation, labelnames=(), registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        registry.register(self)
+
+    def _key(self, labels):
+        return tuple(labels[name] for name in self.labelnames)
+
+    def _labels(self, key):
+        return dict(zip(self.labelnames, key))
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}"
+
+
+class Gauge(Metric):
+    """A gauge set directly or, with ``set_function``, read from a callback at scrape time."""
+
+    type = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), registry=REGISTRY):
+        super().__init__(name, documentation, labelnames, registry)
+        self._function = None
+
+    def set(self, value, **labels):
+        self._values[self._key(labels)] = value
+
+    def set_function(self, function):
+        self._function = function
+
+    def samples(self):
+        if self._function is not None:
+            try:
+                yield f"{self.name} {_format_value(self._function())}"
+            except Exception as e:
+                logger.error(f"Failed to read gauge {self.name}: {e}")
+            return
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}"
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=REGISTRY):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            # Per-bucket (not cumulative) counts, with a final +Inf slot, then the sum.
+            state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def count(self, **labels):
+        state = self._values.get(self._key(labels))
+        return sum(state[:-1]) if state else 0
+
+    def samples(self):
+        for key, state in self._values.items():
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), state):
+                cumulative += count
+                yield f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(labels)} {_format_value(state[-1])}"
+            yield f"{self.name}_count{_format_labels(labels)} {cumulative}"
+
+
+COMMAND_DURATION = Histogram("botzilla_command_duration_seconds", "Time from command invocation to completion.",
+                             ("command", "outcome"))
+UPSTREAM_LATENCY = Histogram("botzilla_upstream_request_seconds", "HTTP request latency to upstream APIs.",
+                             ("host", "status"))
+UPSTREAM_TIMEOUTS = Counter("botzilla_upstream_timeouts_total", "Upstream HTTP requests that timed out.",
+                            ("host",))
+GATEWAY_LATENCY = Histogram("botzilla_gateway_latency_seconds", "Discord gateway heartbeat latency.")
+CACHE_LOOKUPS = Counter("botzilla_http_cache_lookups_total", "Response cache lookups by result.", ("result",))
+FALLBACKS = Counter("botzilla_fallbacks_total", "Times a feature fell back to static content.", ("feature",))
+GAME_TIMEOUTS = Counter("botzilla_game_timeouts_total", "Games that ended because nobody answered.", ("game",))
+ACTIVE_GAMES = Gauge("botzilla_active_games", "Games currently in progress.")
+
+
+class MetricsServer:
+    """Serves ``GET /metrics`` on a local port."""
+
+    def __init__(self, host="127.0.0.1", port=9100, registry=REGISTRY):
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self._runner = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request):
+        return web.Response(body=self.registry.render().encode("utf-8"),
+                            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
@@ -0,0 +1,172 @@
+import os
+import time
+import random as rd
+import asyncio
+import logging
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from src.utils.storage import load_json
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = Path(__file__).parent.parent / "rate_limits.json"
+
+DEFAULT_SETTINGS = {
+    "rate": 10.0,
+    "burst": 10,
+    "max_wait": 5.0,
+    "max_retries": 2,
+    "backoff_base": 0.5,
+    "backoff_cap": 8.0,
+    "failure_threshold": 5,
+    "reset_timeout": 30.0
+}
+
+
+def parse_retry_after(value):
+    """Parse a ``Retry-After`` header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt, base, cap, retry_after=None):
+    """Full-jitter exponential backoff, overridden by the server's ``Retry-After``."""
+    if retry_after is not None:
+        return retry_after
+    return rd.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class TokenBucket:
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return now
+
+    def reserve(self):
+        """Take one token and return how long the caller must wait before using it."""
+        now = self._refill()
+        self.tokens -= 1
+        wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+        return max(wait, self._paused_until - now)
+
+    def refund(self):
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    def pause(self, seconds):
+        self._paused_until = max(self._paused_until, self.clock() + seconds)
+
+    async def acquire(self, max_wait=None):
+        """Wait for a token; return False without waiting if it would take longer than ``max_wait``."""
+        wait = self.reserve()
+        if max_wait is not None and wait > max_wait:
+            self.refund()
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures and fails fast for ``reset_timeout``.
+
+    Once the timeout has passed a single trial request is let through; its
+    result decides whether the breaker closes again or re-opens.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold, reset_timeout, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+
+    def allow(self):
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            return True
+        return False
+
+    def is_available(self):
+        return self.state == self.CLOSED or (
+            self.state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout)
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Circuit opened after {self.failures} consecutive failures")
+            self.state = self.OPEN
+            self._opened_at = self.clock()
+
+
+class HostLimiter:
+    """Rate limit, retry settings and circuit breaker for a single upstream host."""
+
+    def __init__(self, host, settings):
+        self.host = host
+        self.max_wait = settings["max_wait"]
+        self.max_retries = settings["max_retries"]
+        self.backoff_base = settings["backoff_base"]
+        self.backoff_cap = settings["backoff_cap"]
+        self.bucket = TokenBucket(settings["rate"], settings["burst"])
+        self.breaker = CircuitBreaker(settings["failure_threshold"], settings["reset_timeout"])
+
+    def retry_delay(self, attempt, retry_after=None):
+        return backoff_delay(attempt, self.backoff_base, self.backoff_cap, retry_after)
+
+
+class RateLimits:
+    """Registry of per-host limiters built from a JSON config file.
+
+    The file has a ``default`` section and a ``hosts`` section whose entries
+    override the defaults for individual hostnames.
+    """
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.defaults = {**DEFAULT_SETTINGS, **config.get("default", {})}
+        self.host_settings = config.get("hosts", {})
+        self._limiters = {}
+
+    @classmethod
+    def from_file(cls, path=None):
+        path = path or os.getenv("RATE_LIMITS_FILE", DEFAULT_CONFIG_PATH)
+        config = load_json(path)
+        if config is None:
+            logger.warning(f"Rate limit config {path} not found, using defaults")
+        return cls(config)
+
+    def for_host(self, host):
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            settings = {**self.defaults, **self.host_settings.get(host, {})}
+            limiter = self._limiters[host] = HostLimiter(host, settings)
+        return limiter
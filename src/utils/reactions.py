@@ -0,0 +1,71 @@
+import time
+import asyncio
+import logging
+import discord
+
+logger = logging.getLogger(__name__)
+
+
+class ReactionDispatcher:
+    """Adds reactions in the background, paced to Discord's per-channel reaction bucket.
+
+    ``add`` returns immediately so commands can start waiting for input while
+    the reactions are still being added. Each channel gets one reaction slot
+    every ``interval`` seconds, which keeps us under the route's rate limit
+    instead of relying on 429 retries.
+    """
+
+    def __init__(self, interval=0.25, clock=time.monotonic):
+        self.interval = interval
+        self.clock = clock
+        self._next_slot = {}
+        self._tasks = {}
+
+    def add(self, message, emojis):
+        self.cancel(message)
+
+        task = asyncio.create_task(self._add_reactions(message, list(emojis)))
+        self._tasks[message.id] = task
+        task.add_done_callback(lambda t: self._forget(message.id, t))
+        return task
+
+    def cancel(self, message):
+        """Stop adding any reactions that are still pending for ``message``."""
+        task = self._tasks.pop(message.id, None)
+        if task is not None:
+            task.cancel()
+
+    def close(self):
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+    def pending(self):
+        return len(self._tasks)
+
+    def _forget(self, message_id, task):
+        if self._tasks.get(message_id) is task:
+            del self._tasks[message_id]
+
+    def _reserve(self, channel_id):
+        now = self.clock()
+        slot = max(now, self._next_slot.get(channel_id, now))
+        self._next_slot[channel_id] = slot + self.interval
+
+        if len(self._next_slot) > 1024:
+            self._next_slot = {cid: t for cid, t in self._next_slot.items() if t > now}
+        return slot - now
+
+    async def _add_reactions(self, message, emojis):
+        for emoji in emojis:
+            delay = self._reserve(message.channel.id)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                await message.add_reaction(emoji)
+            except (discord.Forbidden, discord.NotFound) as e:
+                logger.debug(f"Stopped adding reactions to {message.id}: {e}")
+                return
+            except discord.HTTPException:
+                continue
@@ -0,0 +1,196 @@
+import time
+import heapq
+import asyncio
+import itertools
+import logging
+from collections import deque
+from src.utils.metrics import GAME_TIMEOUTS
+
+logger = logging.getLogger(__name__)
+
+
+class GameSession:
+    """A chat game in one channel, driven by ``SessionEngine`` callbacks.
+
+    Subclasses keep their state in attributes (declare ``__slots__``) and
+    implement ``on_message`` (return ``True`` to end the game),
+    ``on_timeout`` and, for cleanup, ``on_end``.
+    """
+
+    __slots__ = ("channel_id", "send", "engine", "deadline", "_inbox", "_handler")
+
+    timeout = 30.0
+
+    def __init__(self, channel_id, send):
+        self.channel_id = channel_id
+        self.send = send
+        self.engine = None
+        self.deadline = None
+        self._inbox = None
+        self._handler = None
+
+    @property
+    def active(self):
+        return self.deadline is not None
+
+    def touch(self):
+        """Restart the timeout, e.g. after a valid move."""
+        self.engine.touch(self)
+
+    def accepts(self, message):
+        return True
+
+    async def on_message(self, message):
+        return False
+
+    async def on_timeout(self):
+        pass
+
+    async def on_end(self):
+        pass
+
+
+class SessionEngine:
+    """Runs every active game from one shared timer heap and one message dispatch path.
+
+    A game costs one small object instead of a suspended coroutine with its
+    own timeout handle. Each channel can run one game of each session type.
+    Messages are routed by channel id, and a short-lived task handles them
+    (in order, per session) only while there is something to do.
+    Deadlines live in a single heap served by one timer task; rescheduling a
+    session leaves its old entry behind, which is skipped when popped.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._sessions = {}
+        self._count = 0
+        self._timers = []
+        self._sequence = itertools.count()
+        self._wake = asyncio.Event()
+        self._timer_task = None
+        self._tasks = set()
+
+    def __len__(self):
+        return self._count
+
+    def get(self, channel_id, kind):
+        return self._sessions.get(channel_id, {}).get(kind)
+
+    def start(self, session):
+        """Register ``session``; returns ``False`` if its channel already has a game of that type."""
+        games = self._sessions.setdefault(session.channel_id, {})
+        if type(session) in games:
+            return False
+        games[type(session)] = session
+        self._count += 1
+        session.engine = self
+        self.touch(session)
+        return True
+
+    def touch(self, session, timeout=None):
+        """Restart the session's timeout."""
+        session.deadline = self.clock() + (session.timeout if timeout is None else timeout)
+        heapq.heappush(self._timers, (session.deadline, next(self._sequence), session))
+        if self._timers[0][2] is session:
+            self._wake.set()
+        if self._timer_task is None:
+            self._timer_task = asyncio.create_task(self._run_timers())
+
+    def dispatch(self, message):
+        games = self._sessions.get(message.channel.id)
+        if games:
+            for session in list(games.values()):
+                if not session.active:
+                    continue
+                # This runs inside Bot.dispatch, so an exception here would reach the gateway reader.
+                try:
+                    accepted = session.accepts(message)
+                except Exception as e:
+                    logger.error(f"Error filtering message for {type(session).__name__} in {session.channel_id}: {e}")
+                    continue
+                if accepted:
+                    self._deliver(session, message)
+
+    def _deliver(self, session, message):
+        if session._inbox is None:
+            session._inbox = deque()
+        session._inbox.append(message)
+        if session._handler is None:
+            session._handler = self._spawn(self._drain(session))
+
+    async def end(self, session):
+        games = self._sessions.get(session.channel_id)
+        if not games or games.get(type(session)) is not session:
+            return
+        del games[type(session)]
+        if not games:
+            del self._sessions[session.channel_id]
+        self._count -= 1
+        session.deadline = None
+        session._inbox = None
+        try:
+            await session.on_end()
+        except Exception as e:
+            logger.error(f"Error ending {type(session).__name__} in {session.channel_id}: {e}")
+
+    def close(self):
+        if self._timer_task is not None:
+            self._timer_task.cancel()
+            self._timer_task = None
+        for task in list(self._tasks):
+            task.cancel()
+        self._sessions.clear()
+        self._count = 0
+        self._timers.clear()
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _drain(self, session):
+        try:
+            while session.active and session._inbox:
+                message = session._inbox.popleft()
+                try:
+                    finished = await session.on_message(message)
+                except Exception as e:
+                    logger.error(f"Error in {type(session).__name__} in {session.channel_id}: {e}")
+                    finished = True
+                if finished:
+                    await self.end(session)
+        finally:
+            session._handler = None
+
+    async def _expire(self, session):
+        # Stop accepting answers before the timeout message goes out.
+        session.deadline = None
+        GAME_TIMEOUTS.inc(game=type(session).__name__)
+        try:
+            await session.on_timeout()
+        except Exception as e:
+            logger.error(f"Error timing out {type(session).__name__} in {session.channel_id}: {e}")
+        await self.end(session)
+
+    async def _run_timers(self):
+        while True:
+            if not self._timers:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+
+            deadline, _, session = self._timers[0]
+            delay = deadline - self.clock()
+            if delay > 0:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._timers)
+            if session.deadline == deadline and self.get(session.channel_id, type(session)) is session:
+                self._spawn(self._expire(session))
@@ -0,0 +1,141 @@
+import os
+import time
+import asyncio
+import logging
+import random as rd
+from collections import OrderedDict
+from src.utils.json_decoding import Projection
+
+logger = logging.getLogger(__name__)
+
+TOKEN_URL = "https://accounts.spotify.com/api/token"
+GENRE_SEEDS_URL = "https://api.spotify.com/v1/recommendations/available-genre-seeds"
+SEARCH_URL = "https://api.spotify.com/v1/search"
+# The fields Track.from_api reads out of each search result.
+TRACK_PROJECTION = Projection("tracks.items.name", "tracks.items.artists.name", "tracks.items.external_urls.spotify",
+                              "tracks.items.album.images.url")
+
+
+class Track:
+    __slots__ = ("title", "artist", "url", "image")
+
+    def __init__(self, title, artist, url, image=None):
+        self.title = title
+        self.artist = artist
+        self.url = url
+        self.image = image
+
+    @classmethod
+    def from_api(cls, item):
+        images = item["album"]["images"]
+        return cls(
+            title=item["name"],
+            artist=item["artists"][0]["name"],
+            url=item["external_urls"]["spotify"],
+            image=images[0]["url"] if images else None
+        )
+
+
+class SpotifyClient:
+    """Spotify client-credentials client with a cached token and per-genre track pools.
+
+    The access token is reused until ``refresh_margin`` seconds before it expires
+    and is refreshed by a single request even when many commands need it at once.
+    """
+
+    def __init__(self, api_client, auth=None, refresh_margin=60, pool_ttl=30 * 60, search_limit=50, max_pools=200,
+                 clock=time.monotonic):
+        self.api_client = api_client
+        self.auth = auth if auth is not None else os.getenv("SPOTIFY_AUTH")
+        self.refresh_margin = refresh_margin
+        self.pool_ttl = pool_ttl
+        self.search_limit = search_limit
+        self.max_pools = max_pools
+        self.clock = clock
+        self._token = None
+        self._token_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
+        self._track_pools = OrderedDict()
+
+    async def access_token(self):
+        if self._token_is_valid():
+            return self._token
+
+        async with self._token_lock:
+            # Another caller may have refreshed the token while we waited.
+            if self._token_is_valid():
+                return self._token
+
+            data = await self.api_client.post(
+                TOKEN_URL,
+                data={"grant_type": "client_credentials"},
+                headers={"Authorization": f"Basic {self.auth}"}
+            )
+            if not data or "access_token" not in data:
+                logger.error("Failed to obtain a Spotify access token")
+                return None
+
+            self._token = data["access_token"]
+            self._token_expires_at = self.clock() + data.get("expires_in", 3600) - self.refresh_margin
+            return self._token
+
+    def _token_is_valid(self):
+        return self._token is not None and self.clock() < self._token_expires_at
+
+    def invalidate_token(self):
+        self._token = None
+
+    async def genres(self):
+        """Return the available genre seeds (cached by the shared ApiClient)."""
+        headers = await self._auth_headers()
+        if headers is None:
+            return []
+
+        data = await self.api_client.get(GENRE_SEEDS_URL, headers=headers)
+        return (data or {}).get("genres", [])
+
+    async def recommend(self, genre):
+        """Return a random ``Track`` for ``genre``, or None if Spotify has nothing."""
+        pool = self._track_pools.get(genre)
+        if pool is None or self.clock() >= pool[0]:
+            tracks = await self._search(genre)
+            if not tracks:
+                return None
+            pool = self._track_pools[genre] = (self.clock() + self.pool_ttl, tracks)
+            self._prune_track_pools()
+        self._track_pools.move_to_end(genre)
+
+        return rd.choice(pool[1])
+
+    def _prune_track_pools(self):
+        # Genres are user input, so drop expired pools and cap how many are kept.
+        now = self.clock()
+        for genre in [genre for genre, (expires_at, _) in self._track_pools.items() if now >= expires_at]:
+            del self._track_pools[genre]
+        while len(self._track_pools) > self.max_pools:
+            self._track_pools.popitem(last=False)
+
+    async def _search(self, genre):
+        headers = await self._auth_headers()
+        if headers is None:
+            return []
+
+        params = {
+            "q": f'genre:"{genre}"',
+            "type": "track",
+            "limit": self.search_limit,
+            "market": "US"
+        }
+        data = await self.api_client.get(SEARCH_URL, params=params, headers=headers, projection=TRACK_PROJECTION)
+        if data is None:
+            # Most likely an expired or revoked token; fetch a new one next time.
+            self.invalidate_token()
+            return []
+
+        return [Track.from_api(item) for item in data["tracks"]["items"]]
+
+    async def _auth_headers(self):
+        token = await self.access_token()
+        if token is None:
+            return None
+        return {"Authorization": f"Bearer {token}"}
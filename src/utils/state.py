@@ -0,0 +1,123 @@
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+from pathlib import Path
+from src.utils.storage import data_path
+
+
+class StateBackend:
+    """Key/value store for state that must be visible to every shard.
+
+    Values must be JSON serialisable. ``ttl`` is in seconds; expired keys
+    behave as if they were never set.
+    """
+
+    async def get(self, key, default=None):
+        raise NotImplementedError
+
+    async def set(self, key, value, ttl=None):
+        raise NotImplementedError
+
+    async def add(self, key, value, ttl=None):
+        """Set ``key`` only if it is not already set; return True if it was added."""
+        raise NotImplementedError
+
+    async def delete(self, key):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class MemoryStateBackend(StateBackend):
+    """Process-local backend, suitable for a single process (with or without shards)."""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._data = {}
+
+    def _live(self, key):
+        item = self._data.get(key)
+        if item is not None and item[1] is not None and self.clock() >= item[1]:
+            del self._data[key]
+            return None
+        return item
+
+    async def get(self, key, default=None):
+        item = self._live(key)
+        return default if item is None else item[0]
+
+    async def set(self, key, value, ttl=None):
+        self._data[key] = (value, None if ttl is None else self.clock() + ttl)
+
+    async def add(self, key, value, ttl=None):
+        if self._live(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def delete(self, key):
+        self._data.pop(key, None)
+
+
+class SQLiteStateBackend(StateBackend):
+    """Backend shared by every worker process on one machine through a SQLite file."""
+
+    def __init__(self, path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    async def get(self, key, default=None):
+        rows = await self._run("SELECT value FROM state WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                               (key, time.time()))
+        return json.loads(rows[0][0]) if rows else default
+
+    async def set(self, key, value, ttl=None):
+        await self._run("INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(value), self._expiry(ttl)))
+
+    async def add(self, key, value, ttl=None):
+        return await asyncio.to_thread(self._add, key, json.dumps(value), self._expiry(ttl))
+
+    async def delete(self, key):
+        await self._run("DELETE FROM state WHERE key = ?", (key,))
+
+    @staticmethod
+    def _expiry(ttl):
+        return None if ttl is None else time.time() + ttl
+
+    def _add(self, key, value, expires_at):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM state WHERE key = ? AND expires_at <= ?", (key, time.time()))
+            cursor = self._conn.execute("INSERT OR IGNORE INTO state (key, value, expires_at) VALUES (?, ?, ?)",
+                                        (key, value, expires_at))
+            return cursor.rowcount == 1
+
+    async def _run(self, query, params):
+        return await asyncio.to_thread(self._execute, query, params)
+
+    def _execute(self, query, params):
+        with self._lock, self._conn:
+            return self._conn.execute(query, params).fetchall()
+
+
+def create_state_backend(name=None):
+    """Build the backend selected by ``STATE_BACKEND`` (``memory`` or ``sqlite``)."""
+    name = name or os.getenv("STATE_BACKEND", "memory")
+    if name == "memory":
+        return MemoryStateBackend()
+    if name == "sqlite":
+        return SQLiteStateBackend(os.getenv("STATE_DB", data_path("state.db")))
+    raise ValueError(f"Unknown state backend: {name}")
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stats (
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    stat TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, user_id, stat)
+);
+CREATE INDEX IF NOT EXISTS stats_by_value ON stats (guild_id, stat, value DESC);
+"""
+
+ADD_QUERY = ("INSERT INTO stats (guild_id, user_id, stat, value) VALUES (?, ?, ?, ?) "
+             "ON CONFLICT (guild_id, user_id, stat) DO UPDATE SET value = value + excluded.value")
+MAX_QUERY = ("INSERT INTO stats (guild_id, user_id, stat, value) VALUES (?, ?, ?, ?) "
+             "ON CONFLICT (guild_id, user_id, stat) DO UPDATE SET value = MAX(value, excluded.value)")
+TOP_QUERY = "SELECT user_id, value FROM stats WHERE guild_id = ? AND stat = ? ORDER BY value DESC LIMIT ?"
+
+# Stats that keep a personal best rather than a running total.
+MAX_STATS = {"wordgame_longest_chain"}
+
+
+class StatsStore:
+    """Per-guild game stats with write-behind batching.
+
+    ``increment`` and ``record_max`` only touch in-memory counters. Every
+    ``flush_interval`` seconds the pending deltas go to SQLite in a single
+    transaction, as additive upserts so several worker processes can share
+    the database. Each flush then recomputes the top ``top_n`` of every
+    leaderboard that changed, and leaderboard queries are served from that
+    cache instead of the database.
+    """
+
+    def __init__(self, path, flush_interval=10.0, top_n=10):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+        self.flush_interval = flush_interval
+        self.top_n = top_n
+        self._pending = {}
+        self._top = {}
+        self._flush_task = None
+
+    def start(self):
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_periodically())
+
+    async def close(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def increment(self, guild_id, user_id, stat, amount=1):
+        key = (guild_id, user_id, stat)
+        self._pending[key] = self._pending.get(key, 0) + amount
+
+    def record_max(self, guild_id, user_id, stat, value):
+        key = (guild_id, user_id, stat)
+        self._pending[key] = max(self._pending.get(key, value), value)
+
+    async def flush(self):
+        """Write all pending deltas in one transaction and refresh the affected leaderboards."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        try:
+            tops = await asyncio.to_thread(self._write, pending)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to flush {len(pending)} stat update(s): {e}")
+            for (guild_id, user_id, stat), value in pending.items():
+                if stat in MAX_STATS:
+                    self.record_max(guild_id, user_id, stat, value)
+                else:
+                    self.increment(guild_id, user_id, stat, value)
+            return
+        self._top.update(tops)
+
+    async def leaderboard(self, guild_id, stat):
+        """The top ``top_n`` ``(user_id, value)`` pairs for ``stat``, as of the last flush."""
+        top = self._top.get((guild_id, stat))
+        if top is None:
+            top = self._top[(guild_id, stat)] = await asyncio.to_thread(self._query_top, guild_id, stat)
+        return top
+
+    async def user_stats(self, guild_id, user_id):
+        """All stats for one member, including updates that have not been flushed yet."""
+        rows = await asyncio.to_thread(
+            self._execute, "SELECT stat, value FROM stats WHERE guild_id = ? AND user_id = ?", (guild_id, user_id))
+        stats = dict(rows)
+        for (g, u, stat), value in self._pending.items():
+            if g == guild_id and u == user_id:
+                stats[stat] = max(stats.get(stat, 0), value) if stat in MAX_STATS else stats.get(stat, 0) + value
+        return stats
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def _write(self, pending):
+        adds = [(*key, value) for key, value in pending.items() if key[2] not in MAX_STATS]
+        maxima = [(*key, value) for key, value in pending.items() if key[2] in MAX_STATS]
+        changed = {(guild_id, stat) for guild_id, _, stat in pending}
+        with self._lock, self._conn:
+            self._conn.executemany(ADD_QUERY, adds)
+            self._conn.executemany(MAX_QUERY, maxima)
+            return {key: self._conn.execute(TOP_QUERY, (*key, self.top_n)).fetchall() for key in changed}
+
+    def _query_top(self, guild_id, stat):
+        return self._execute(TOP_QUERY, (guild_id, stat, self.top_n))
+
+    def _execute(self, query, params):
+        with self._lock, self._conn:
+            return self._conn.execute(query, params).fetchall()
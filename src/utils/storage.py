@@ -0,0 +1,28 @@
+import os
+import json
+from pathlib import Path
+
+DATA_DIR = Path(os.getenv("BOTZILLA_DATA_DIR", Path(__file__).parent.parent / "data"))
+
+
+def data_path(name):
+    """Return the path of a file in the bot's local data directory."""
+    return DATA_DIR / name
+
+
+def load_json(path, default=None):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(path, data):
+    """Atomically write ``data`` as JSON so a crash never leaves a truncated file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
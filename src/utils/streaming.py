@@ -0,0 +1,75 @@
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def render_text(text):
+    """Render streamed text as message content; Discord rejects empty or whitespace-only messages."""
+    return {"content": text if text.strip() else "..."}
+
+
+class StreamingMessage:
+    """Renders streamed text into a single Discord message as it arrives.
+
+    The message is sent with the first chunk and then edited at most once per
+    ``min_interval`` seconds, which keeps us inside Discord's message edit
+    rate limit no matter how fast tokens arrive. ``finish`` always makes a
+    final edit with the complete text.
+
+    ``render`` turns the text so far into ``send``/``edit`` keyword arguments.
+    """
+
+    def __init__(self, send, render, min_interval=1.0, label="stream", started=None, clock=time.monotonic):
+        self.send = send
+        self.render = render
+        self.min_interval = min_interval
+        self.label = label
+        self.clock = clock
+        self.started = clock() if started is None else started
+        self.message = None
+        self.text = ""
+        self.edits = 0
+        self.first_visible = None
+        self._last_edit = None
+        self._dirty = False
+
+    async def consume(self, chunks):
+        async for chunk in chunks:
+            await self.feed(chunk)
+        return self.text
+
+    async def feed(self, chunk):
+        if not chunk:
+            return
+        self.text += chunk
+
+        if self.message is None:
+            if not self.text.strip():
+                return
+            self.message = await self.send(**self.render(self.text))
+            self._last_edit = self.clock()
+            self.first_visible = self._last_edit - self.started
+        elif self.clock() - self._last_edit >= self.min_interval:
+            await self._edit(**self.render(self.text))
+        else:
+            self._dirty = True
+
+    async def finish(self, **overrides):
+        """Make the final edit (or send, if nothing was visible yet) and return the message."""
+        kwargs = {**self.render(self.text), **overrides}
+        if self.message is None:
+            self.message = await self.send(**kwargs)
+            self.first_visible = self.clock() - self.started
+        elif self._dirty or overrides:
+            await self._edit(**kwargs)
+
+        logger.info(f"{self.label}: first visible text after {self.first_visible * 1000:.0f}ms, "
+                    f"{len(self.text)} chars in {self.clock() - self.started:.1f}s, {self.edits} edit(s)")
+        return self.message
+
+    async def _edit(self, **kwargs):
+        await self.message.edit(**kwargs)
+        self._last_edit = self.clock()
+        self._dirty = False
+        self.edits += 1
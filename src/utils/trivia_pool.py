@@ -0,0 +1,192 @@
+import os
+import asyncio
+import logging
+from collections import deque
+from urllib.parse import unquote_plus
+from src.utils.storage import data_path, load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+OPENTDB_URL = "https://opentdb.com/api.php"
+OPENTDB_TOKEN_URL = "https://opentdb.com/api_token.php"
+
+# OpenTDB response codes
+RESPONSE_OK = 0
+RESPONSE_TOKEN_NOT_FOUND = 3
+RESPONSE_TOKEN_EMPTY = 4
+
+
+def decode_question(raw):
+    return {
+        "question": unquote_plus(raw["question"]),
+        "correct_answer": unquote_plus(raw["correct_answer"]),
+        "incorrect_answers": [unquote_plus(a) for a in raw["incorrect_answers"]],
+        "category": unquote_plus(raw.get("category", "")),
+        "difficulty": unquote_plus(raw.get("difficulty", ""))
+    }
+
+
+class TriviaPool:
+    """Background-refilled pool of decoded OpenTDB questions.
+
+    Questions are kept per ``(category, difficulty)`` key. When a pool drops
+    below ``low_watermark`` it is refilled in bulk up to ``high_watermark``,
+    using an OpenTDB session token so questions are not repeated.
+    """
+
+    def __init__(self, api_client, path=None, low_watermark=10, high_watermark=100, batch_size=50,
+                 min_interval=5.0, wait_timeout=15.0):
+        self.api_client = api_client
+        if path is None:
+            # Each worker process keeps its own pool file.
+            worker_id = os.getenv("BOTZILLA_WORKER_ID")
+            path = data_path(f"trivia_pool-{worker_id}.json" if worker_id else "trivia_pool.json")
+        self.path = path
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.batch_size = batch_size
+        self.min_interval = min_interval
+        self.wait_timeout = wait_timeout
+        self._pools = {}
+        self._ready = {}
+        self._refill_tasks = {}
+        self._token = None
+        self._fetch_lock = asyncio.Lock()
+        self._last_fetch = None
+
+    def size(self, category=None, difficulty=None):
+        return len(self._pools.get((category, difficulty), ()))
+
+    async def take(self, category=None, difficulty=None):
+        """Pop a question, waiting for a refill only when the pool is empty."""
+        key = (category, difficulty)
+        pool = self._pool(key)
+
+        if not pool:
+            ready = self._ready.setdefault(key, asyncio.Event())
+            ready.clear()
+            self.schedule_refill(category, difficulty)
+            try:
+                await asyncio.wait_for(ready.wait(), timeout=self.wait_timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        if not pool:
+            return None
+
+        question = pool.popleft()
+        if len(pool) < self.low_watermark:
+            self.schedule_refill(category, difficulty)
+        return question
+
+    def schedule_refill(self, category=None, difficulty=None):
+        key = (category, difficulty)
+        if key in self._refill_tasks:
+            return
+
+        task = asyncio.create_task(self._refill(key))
+        self._refill_tasks[key] = task
+        task.add_done_callback(lambda _: self._refill_tasks.pop(key, None))
+
+    async def _refill(self, key):
+        pool = self._pool(key)
+        try:
+            while len(pool) < self.high_watermark:
+                batch = await self._fetch_batch(key, min(self.batch_size, self.high_watermark - len(pool)))
+                if not batch:
+                    break
+                pool.extend(batch)
+                self._wake(key)
+            self.save()
+        except Exception as e:
+            logger.error(f"Trivia pool refill failed for {key}: {e}")
+        finally:
+            self._wake(key)
+
+    async def _fetch_batch(self, key, amount):
+        category, difficulty = key
+        async with self._fetch_lock:
+            for _ in range(2):
+                await self._respect_rate_limit()
+
+                params = {"amount": amount, "encode": "url3986"}
+                token = await self._session_token()
+                if token:
+                    params["token"] = token
+                if category is not None:
+                    params["category"] = category
+                if difficulty is not None:
+                    params["difficulty"] = difficulty
+
+                data = await self.api_client.get(OPENTDB_URL, params=params)
+                self._last_fetch = asyncio.get_running_loop().time()
+
+                code = data.get("response_code") if data else None
+                if code == RESPONSE_OK:
+                    return [decode_question(q) for q in data["results"]]
+                if code == RESPONSE_TOKEN_NOT_FOUND:
+                    self._token = None
+                elif code == RESPONSE_TOKEN_EMPTY:
+                    await self._reset_token()
+                else:
+                    logger.warning(f"OpenTDB returned response code {code} for {key}")
+                    return []
+        return []
+
+    async def _respect_rate_limit(self):
+        if self._last_fetch is None:
+            return
+        delay = self._last_fetch + self.min_interval - asyncio.get_running_loop().time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _session_token(self):
+        if self._token is None:
+            data = await self.api_client.get(OPENTDB_TOKEN_URL, params={"command": "request"})
+            if data and data.get("response_code") == RESPONSE_OK:
+                self._token = data["token"]
+        return self._token
+
+    async def _reset_token(self):
+        if self._token is None:
+            return
+        await self.api_client.get(OPENTDB_TOKEN_URL, params={"command": "reset", "token": self._token})
+        self._last_fetch = asyncio.get_running_loop().time()
+
+    def _pool(self, key):
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = deque()
+        return pool
+
+    def _wake(self, key):
+        ready = self._ready.get(key)
+        if ready is not None:
+            ready.set()
+
+    def load(self):
+        data = load_json(self.path)
+        if not data:
+            return
+
+        self._token = data.get("token")
+        for entry in data.get("pools", []):
+            key = (entry.get("category"), entry.get("difficulty"))
+            self._pool(key).extend(entry.get("questions", []))
+
+    def save(self):
+        pools = [
+            {"category": category, "difficulty": difficulty, "questions": list(pool)}
+            for (category, difficulty), pool in self._pools.items()
+            if pool
+        ]
+        try:
+            save_json(self.path, {"token": self._token, "pools": pools})
+        except OSError as e:
+            logger.error(f"Failed to save trivia pool: {e}")
+
+    async def close(self):
+        for task in list(self._refill_tasks.values()):
+            task.cancel()
+        self._refill_tasks.clear()
+        self.save()
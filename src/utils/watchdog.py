@@ -0,0 +1,99 @@
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from pathlib import Path
+from src.utils.metrics import Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+COGS_DIR = str(Path(__file__).resolve().parent.parent / "cogs")
+
+LOOP_LAG = Histogram("botzilla_event_loop_lag_seconds", "How late the event loop ran a scheduled wakeup.",
+                     buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0))
+LOOP_LAG_MAX = Gauge("botzilla_event_loop_lag_max_seconds", "Largest loop lag seen since the last scrape.")
+LOOP_STALLS = Counter("botzilla_event_loop_stalls_total", "Callbacks that blocked the loop past the threshold.",
+                      ("location",))
+
+
+def blocking_location(frame):
+    """Name the innermost cog function in ``frame``'s stack, e.g. ``Fun.fireworks``, or ``None``."""
+    while frame is not None:
+        if frame.f_code.co_filename.startswith(COGS_DIR):
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            return f"{type(owner).__name__}.{name}" if owner is not None else name
+        frame = frame.f_back
+    return None
+
+
+class LoopWatchdog:
+    """Measures event-loop lag continuously and reports callbacks that block the loop.
+
+    A heartbeat task on the loop wakes every ``interval`` seconds and records
+    how late it ran. A daemon thread checks the heartbeat; when the loop has
+    been stuck for longer than ``threshold`` it samples the loop thread's
+    stack once and logs it, naming the cog command that is blocking. Both
+    sides only wake a few times a second, so it is cheap enough to leave on.
+    """
+
+    def __init__(self, interval=0.1, threshold=0.25):
+        self.interval = interval
+        self.threshold = threshold
+        self.max_lag = 0.0
+        self.stalls = 0
+        self._last_beat = None
+        self._loop_thread_id = None
+        self._task = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        LOOP_LAG_MAX.set_function(self._take_max_lag)
+
+    def stop(self):
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _take_max_lag(self):
+        lag, self.max_lag = self.max_lag, 0.0
+        return lag
+
+    async def _heartbeat(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            LOOP_LAG.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+            self._last_beat = time.monotonic()
+
+    def _watch(self):
+        reported_beat = None
+        while not self._stopped.wait(self.threshold / 2):
+            beat = self._last_beat
+            stalled_for = time.monotonic() - beat - self.interval
+            if stalled_for < self.threshold or beat == reported_beat:
+                continue
+
+            # Report each stall once, while it is still happening.
+            reported_beat = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            location = blocking_location(frame) or "unknown"
+            self.stalls += 1
+            LOOP_STALLS.inc(location=location)
+            stack = "".join(traceback.format_stack(frame, limit=15))
+            logger.warning(f"Event loop blocked for {stalled_for * 1000:.0f}ms in {location}:\n{stack}")
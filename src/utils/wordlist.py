@@ -0,0 +1,109 @@
+"""Memory-mapped dictionary for the word chain game.
+
+The index is a plain file of lowercase ASCII words, sorted, one per line. It
+is memory-mapped read-only, so every worker process shares the same page
+cache pages instead of each building a Python set. Build one from any word
+list with ``python src/utils/wordlist.py <source> <dest>``.
+"""
+import os
+import mmap
+import random
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def build_index(source, dest, min_length=2):
+    """Normalise the word list at ``source`` into a sorted index file at ``dest``; returns the word count."""
+    with open(source, "r", encoding="utf-8", errors="ignore") as f:
+        words = {w for w in (line.strip().lower() for line in f)
+                 if len(w) >= min_length and w.isascii() and w.isalpha()}
+
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest.with_suffix(dest.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="ascii") as f:
+        f.writelines(f"{w}\n" for w in sorted(words))
+    os.replace(tmp_path, dest)
+    return len(words)
+
+
+class WordIndex:
+    """O(log n) membership and first-letter lookups by binary search over the mapped file."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._ranges = {}
+
+    @classmethod
+    def load(cls, path):
+        """Return the index at ``path``, or ``None`` if it does not exist or is empty."""
+        try:
+            return cls(path)
+        except (OSError, ValueError) as e:
+            logger.info(f"Word index not available at {path}: {e}")
+            return None
+
+    def close(self):
+        self._map.close()
+
+    def __contains__(self, word):
+        if not word or not word.isascii():
+            return False
+        key = word.encode("ascii")
+        start = self._lower_bound(key)
+        return self._line(start)[1] == key
+
+    def random_word(self, letter, exclude=(), attempts=20):
+        """A random word starting with ``letter`` that is not in ``exclude``, or ``None``."""
+        start, end = self._letter_range(letter)
+        if start == end:
+            return None
+
+        for _ in range(attempts):
+            # Lines are picked by byte offset, so this is only roughly uniform.
+            line_start = self._map.rfind(b"\n", start, random.randrange(start, end)) + 1 or start
+            word = self._line(line_start)[1].decode("ascii")
+            if word not in exclude:
+                return word
+
+        # Unlucky or nearly exhausted: scan the range for anything left.
+        for word in self._map[start:end].decode("ascii").split():
+            if word not in exclude:
+                return word
+        return None
+
+    def _letter_range(self, letter):
+        bounds = self._ranges.get(letter)
+        if bounds is None:
+            key = letter.encode("ascii")
+            bounds = self._ranges[letter] = (self._lower_bound(key), self._lower_bound(bytes([key[0] + 1])))
+        return bounds
+
+    def _line(self, start):
+        end = self._map.find(b"\n", start)
+        if end == -1:
+            end = len(self._map)
+        return end, self._map[start:end]
+
+    def _lower_bound(self, key):
+        """Byte offset of the first line that sorts at or after ``key``."""
+        lo, hi = 0, len(self._map)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self._map.rfind(b"\n", 0, mid) + 1
+            end, line = self._line(start)
+            if line < key:
+                lo = end + 1
+            else:
+                hi = start
+        return lo
+
+
+if __name__ == '__main__':
+    import sys
+
+    count = build_index(sys.argv[1], sys.argv[2])
+    print(f"Wrote {count} words to {sys.argv[2]}")
@@ -0,0 +1,44 @@
+import pytest
+import json
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.utils.adventure_pool import AdventurePool, parse_scenarios
+
+
+def adventure(i):
+    return {"scenario": f"Scenario {i}", "choices": ["a", "b", "c"], "outcomes": ["x", "y", "z"]}
+
+
+def test_parse_scenarios_drops_malformed_entries():
+    text = json.dumps({"adventures": [adventure(1), {"scenario": "no choices"},
+                                      {**adventure(2), "outcomes": ["only one"]}]})
+    assert parse_scenarios(text) == [adventure(1)]
+    assert parse_scenarios("not json") == []
+
+
+@pytest.mark.asyncio
+async def test_take_is_instant_and_refills_in_background(tmp_path):
+    calls = []
+
+    async def generate(count):
+        calls.append(count)
+        return [adventure(len(calls) * 10 + i) for i in range(count)]
+
+    pool = AdventurePool(generate, path=tmp_path / "pool.json", low_watermark=2, high_watermark=4, batch_size=2,
+                         idle_delay=0, min_interval=0)
+    assert pool.take() is None
+
+    await asyncio.sleep(0.01)
+    assert calls == [2, 2]
+    assert pool.size() == 4
+
+    assert pool.take()["scenario"] == "Scenario 10"
+    await pool.close()
+
+    reloaded = AdventurePool(generate, path=tmp_path / "pool.json")
+    reloaded.load()
+    assert reloaded.size() == 3
@@ -0,0 +1,229 @@
+import pytest
+import asyncio
+from unittest.mock import MagicMock, AsyncMock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.utils.api_client import ApiClient
+from src.utils.cache import CachePolicy, ResponseCache
+from src.utils.json_decoding import Projection
+from src.utils.ratelimit import RateLimits
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def client(clock):
+    client = ApiClient(
+        session=MagicMock(),
+        cache=ResponseCache(max_bytes=1000, clock=clock),
+        cache_policies=[CachePolicy(r"https://cached\.example/", ttl=10, stale_ttl=20)]
+    )
+    client._request = AsyncMock(return_value=({"items": [1, 2, 3]}, 100))
+    return client
+
+
+def test_response_cache_evicts_least_recently_used(clock):
+    cache = ResponseCache(max_bytes=250, clock=clock)
+    cache.set("a", 1, 100, ttl=10)
+    cache.set("b", 2, 100, ttl=10)
+    cache.get("a")
+    cache.set("c", 3, 100, ttl=10)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.size == 200
+
+
+def test_response_cache_expires_after_stale_window(clock):
+    cache = ResponseCache(clock=clock)
+    cache.set("a", 1, 10, ttl=10, stale_ttl=5)
+
+    clock.now = 12
+    entry = cache.get("a")
+    assert entry.value == 1
+    assert not entry.is_fresh(clock())
+
+    clock.now = 15
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_serves_fresh_entries_from_cache(client):
+    first = await client.get("https://cached.example/a", params={"q": "cat", "limit": 25})
+    second = await client.get("https://cached.example/a", params={"limit": 25, "q": "cat"})
+
+    assert first == second == {"items": [1, 2, 3]}
+    client._request.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_bypasses_cache_without_policy(client):
+    await client.get("https://uncached.example/a")
+    await client.get("https://uncached.example/a")
+
+    assert client._request.await_count == 2
+    assert len(client.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_returns_stale_entry_and_refreshes_in_background(client, clock):
+    await client.get("https://cached.example/a")
+    client._request.return_value = ({"items": [4]}, 50)
+
+    clock.now = 15
+    stale = await client.get("https://cached.example/a")
+    assert stale == {"items": [1, 2, 3]}
+
+    await asyncio.gather(*client._refresh_tasks.values())
+    assert await client.get("https://cached.example/a") == {"items": [4]}
+    assert client._request.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_responses_are_not_cached(client):
+    client._request.return_value = (None, 0)
+    assert await client.get("https://cached.example/a") is None
+    assert len(client.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_are_coalesced(client):
+    async def slow_request(method, url, params=None, data=None, headers=None):
+        await asyncio.sleep(0.01)
+        return {"joke": "ha"}, 10
+
+    client._request = AsyncMock(side_effect=slow_request)
+
+    results = await asyncio.gather(*(client.get("https://uncached.example/joke") for _ in range(5)))
+
+    assert all(r == {"joke": "ha"} for r in results)
+    client._request.assert_awaited_once()
+    assert client.coalesced == 4
+    assert client.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_key_func_controls_coalescing(client):
+    async def slow_request(method, url, params=None, data=None, headers=None):
+        await asyncio.sleep(0.01)
+        return {}, 2
+
+    client.key_func = lambda url, params: (url, (params or {}).get("q", "").strip().lower())
+    client._request = AsyncMock(side_effect=slow_request)
+
+    await asyncio.gather(
+        client.get("https://uncached.example/search", params={"q": "Cat "}),
+        client.get("https://uncached.example/search", params={"q": "cat"})
+    )
+
+    client._request.assert_awaited_once()
+
+
+class FakeResponse:
+    def __init__(self, status, body=b"{}", headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    async def read(self):
+        return self.body
+
+    async def text(self):
+        return self.body.decode()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def session_returning(*responses):
+    session = MagicMock()
+    session.request = MagicMock(side_effect=list(responses))
+    return session
+
+
+@pytest.mark.asyncio
+async def test_request_retries_after_429_honouring_retry_after():
+    session = session_returning(FakeResponse(429, headers={"Retry-After": "0"}), FakeResponse(200, b'{"ok": 1}'))
+    client = ApiClient(session=session, rate_limits=RateLimits({"default": {"max_retries": 2}}))
+
+    assert await client.get("https://limited.example/a") == {"ok": 1}
+    assert session.request.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_request_fails_fast_while_circuit_is_open():
+    session = session_returning(*(FakeResponse(503) for _ in range(3)))
+    client = ApiClient(session=session, rate_limits=RateLimits(
+        {"default": {"max_retries": 0, "failure_threshold": 2}}))
+
+    assert await client.get("https://down.example/a") is None
+    assert await client.get("https://down.example/b") is None
+    assert not client.is_available("down.example")
+
+    assert await client.get("https://down.example/c") is None
+    assert session.request.call_count == 2
+
+
+def test_projection_keeps_only_requested_paths():
+    projection = Projection("data.images.original.url", "meta")
+    payload = {
+        "data": [{"id": "a", "images": {"original": {"url": "u1", "size": 9}, "fixed": {"url": "f"}}},
+                 {"id": "b", "images": {}}],
+        "meta": {"status": 200},
+        "pagination": {"count": 2},
+    }
+
+    assert projection(payload) == {
+        "data": [{"images": {"original": {"url": "u1"}}}, {"images": {}}],
+        "meta": {"status": 200},
+    }
+
+
+@pytest.mark.asyncio
+async def test_projected_response_is_cached_under_its_own_key():
+    body = b'{"data": [{"id": "a", "images": {"original": {"url": "u1"}}}], "pagination": {"count": 1}}'
+    session = session_returning(FakeResponse(200, body), FakeResponse(200, body))
+    client = ApiClient(session=session, cache_policies=[CachePolicy(r"https://cached\.example/", ttl=10)])
+    projection = Projection("data.images.original.url")
+
+    projected = await client.get("https://cached.example/search", projection=projection)
+    assert projected == {"data": [{"images": {"original": {"url": "u1"}}}]}
+    assert await client.get("https://cached.example/search", projection=projection) == projected
+    assert session.request.call_count == 1
+
+    assert "pagination" in await client.get("https://cached.example/search")
+    assert session.request.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_half_open_trial_reopens_circuit():
+    session = session_returning(FakeResponse(500), FakeResponse(500), FakeResponse(429, headers={"Retry-After": "0"}),
+                                FakeResponse(200, b'{"ok": 1}'))
+    client = ApiClient(session=session, rate_limits=RateLimits({"default": {
+        "max_retries": 1, "backoff_base": 0, "failure_threshold": 1, "reset_timeout": 0}}))
+
+    assert await client.get("https://flaky.example/a") is None
+    assert await client.get("https://flaky.example/b") is None
+    assert client.is_available("flaky.example")
+
+    assert await client.get("https://flaky.example/c") == {"ok": 1}
+    assert session.request.call_count == 4
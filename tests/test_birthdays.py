@@ -0,0 +1,57 @@
+import pytest
+import datetime
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.utils.birthdays import BirthdayStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = BirthdayStore(tmp_path / "birthdays.db")
+    yield store
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_for_date_returns_only_that_days_bucket(store):
+    await store.set(1, 100, 10, 12, 25)
+    await store.set(2, 100, 20, 12, 25)
+    await store.set(1, 101, 10, 1, 1)
+
+    rows = await store.for_date(datetime.date(2026, 12, 25))
+    assert sorted(rows) == [(1, 100, 10), (2, 100, 20)]
+
+
+@pytest.mark.asyncio
+async def test_set_replaces_existing_birthday_in_guild(store):
+    await store.set(1, 100, 10, 12, 25)
+    await store.set(1, 100, 11, 6, 1)
+
+    assert await store.for_date(datetime.date(2026, 12, 25)) == []
+    assert await store.for_date(datetime.date(2026, 6, 1)) == [(1, 100, 11)]
+
+
+@pytest.mark.asyncio
+async def test_leap_day_birthdays_celebrated_on_feb_28(store):
+    await store.set(1, 100, 10, 2, 29)
+
+    assert await store.for_date(datetime.date(2026, 2, 28)) == [(1, 100, 10)]
+    assert await store.for_date(datetime.date(2028, 2, 28)) == []
+    assert await store.for_date(datetime.date(2028, 2, 29)) == [(1, 100, 10)]
+
+
+@pytest.mark.asyncio
+async def test_birthdays_persist_across_instances(tmp_path):
+    path = tmp_path / "birthdays.db"
+    store = BirthdayStore(path)
+    await store.set(1, 100, 10, 3, 14)
+    await store.set_meta("last_announced", "2026-03-14")
+    store.close()
+
+    reopened = BirthdayStore(path)
+    assert await reopened.for_date(datetime.date(2026, 3, 14)) == [(1, 100, 10)]
+    assert await reopened.get_meta("last_announced") == "2026-03-14"
+    reopened.close()
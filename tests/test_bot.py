@@ -14,11 +14,13 @@ pytestmark = pytest.mark.asyncio
 
 
 @pytest.fixture
-def bot():
+def bot(tmp_path):
     with patch('discord.ext.commands.Bot.start'), \
         patch('discord.ext.commands.Bot.connect'), \
         patch.object(Bot, 'load_extensions', AsyncMock()):
         bot = Bot()
+        bot.command_hash_path = tmp_path / "command_tree.json"
+        bot.stats_path = tmp_path / "stats.db"
         yield bot
 
 
@@ -99,6 +101,20 @@ async def test_setup_hook(bot):
         mock_load_extensions.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_setup_hook_creates_shared_api_client(bot):
+    with patch.object(bot, 'load_extensions', AsyncMock()):
+        await bot.setup_hook()
+
+    api_client = bot.api_client
+    assert api_client is not None
+    assert api_client.session.connector.limit_per_host == 10
+
+    await bot.close()
+    assert bot.api_client is None
+    assert api_client.session.closed
+
+
 @pytest.mark.asyncio
 async def test_on_ready_with_sync_exception(bot):
     with patch.object(Bot, 'user', new_callable=PropertyMock) as mock_user, \
@@ -217,4 +233,209 @@ async def test_env_loading():
         importlib.reload(src.bot)
 
         mock_getenv.assert_any_call('DISCORD_TOKEN')
-        assert src.bot.TOKEN == 'test-token'
\ No newline at end of file
+        assert src.bot.TOKEN == 'test-token'
+
+
+@pytest.mark.asyncio
+async def test_dispatch_routes_events_to_router(bot):
+    with patch.object(bot.events, 'dispatch') as mock_route, \
+            patch('discord.ext.commands.Bot.dispatch') as mock_dispatch:
+        message = MagicMock()
+        bot.dispatch('message', message)
+
+        mock_route.assert_called_once_with('message', message)
+        mock_dispatch.assert_called_once_with('message', message)
+
+
+@pytest.mark.asyncio
+async def test_load_extensions_from_manifest_records_timings():
+    from src.bot import EXTENSIONS
+
+    with patch('discord.ext.commands.Bot.start'):
+        bot = Bot()
+
+    with patch.object(bot, 'load_extension', AsyncMock()) as mock_load_extension:
+        await bot.load_extensions()
+
+    assert [c.args[0] for c in mock_load_extension.await_args_list] == list(EXTENSIONS)
+    assert set(bot.startup_timings) == set(EXTENSIONS)
+    assert all(t["import"] >= 0 and t["setup"] >= 0 for t in bot.startup_timings.values())
+
+
+@pytest.mark.asyncio
+async def test_sync_commands_skips_unchanged_tree(bot):
+    from discord import app_commands
+
+    @app_commands.command(name="ping", description="Ping")
+    async def ping(interaction):
+        pass
+
+    bot.tree.add_command(ping)
+
+    with patch.object(bot.tree, 'sync', AsyncMock(return_value=[ping])) as mock_sync:
+        await bot.sync_commands()
+        await bot.sync_commands()
+        mock_sync.assert_awaited_once_with(guild=None)
+
+        @app_commands.command(name="pong", description="Pong")
+        async def pong(interaction):
+            pass
+
+        bot.tree.add_command(pong)
+        await bot.sync_commands()
+        assert mock_sync.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_sync_commands_targets_dev_guilds(bot):
+    bot.dev_guild_ids = [123]
+
+    with patch.object(bot.tree, 'sync', AsyncMock(return_value=[])) as mock_sync:
+        await bot.sync_commands()
+
+    assert mock_sync.await_args.kwargs["guild"].id == 123
+
+
+@pytest.mark.asyncio
+async def test_shard_ranges_split_evenly():
+    from src.launcher import shard_ranges
+
+    assert shard_ranges(10, 3) == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    assert shard_ranges(2, 4) == [[0], [1]]
+
+
+@pytest.mark.asyncio
+async def test_owns_guild_for_shard_subset():
+    from src.bot import ShardedBot
+
+    bot = ShardedBot(shard_ids=[1], shard_count=2)
+    guild_on_shard_1 = 1 << 22
+    assert bot.owns_guild(guild_on_shard_1)
+    assert not bot.owns_guild(0)
+    assert not bot.is_primary_shard
+
+
+@pytest.mark.asyncio
+async def test_auto_sharded_bot_owns_every_shard():
+    from src.bot import ShardedBot
+
+    bot = ShardedBot(shard_count=4)
+    assert all(bot.owns_guild(shard << 22) for shard in range(4))
+    assert bot.is_primary_shard
+
+
+@pytest.mark.asyncio
+async def test_cache_profiles():
+    from src.bot import cache_profile
+
+    assert cache_profile("full")["intents"].voice_states
+    lean = cache_profile("lean")
+    assert lean["intents"].message_content and lean["intents"].reactions
+    assert not lean["intents"].voice_states and not lean["intents"].typing
+    assert lean["chunk_guilds_at_startup"] is False
+    assert cache_profile("minimal")["max_messages"] is None
+
+    with patch.dict(os.environ, {"CACHE_PROFILE": "minimal"}):
+        bot = Bot()
+    assert bot._connection.max_messages is None
+    assert not bot._connection.member_cache_flags.voice
+
+
+@pytest.mark.asyncio
+async def test_without_message_content():
+    with patch.dict(os.environ, {"MESSAGE_CONTENT": "0"}):
+        bot = Bot()
+    assert bot.intents.message_content is False
+    assert bot.command_prefix is discord.ext.commands.when_mentioned
+
+
+@pytest.mark.asyncio
+async def test_cog_commands_are_slash_commands(bot):
+    from cogs.fun import Fun
+
+    await bot.add_cog(Fun(bot))
+    assert {"joke", "gif", "meme", "8ball"} <= {command.name for command in bot.tree.get_commands()}
+    await bot.close()
+
+
+async def test_birthday_announcements_skip_departed_members(bot, tmp_path, monkeypatch):
+    from cogs.utility import Utility
+
+    monkeypatch.setenv("BIRTHDAY_DB", str(tmp_path / "birthdays.db"))
+    cog = Utility(bot)
+    cog.check_birthdays.cancel()
+    channel = MagicMock()
+    channel.send = AsyncMock()
+    bot.get_or_fetch_channel = AsyncMock(return_value=channel)
+    bot.get_or_fetch_member = AsyncMock(
+        side_effect=lambda guild, user_id: MagicMock(id=user_id) if user_id == 1 else None)
+    try:
+        await cog._announce_birthdays(asyncio.Semaphore(1), 10, [1, 2])
+        channel.send.assert_awaited_once_with("🎂 Happy Birthday, <@1>! 🎉")
+    finally:
+        cog.cog_unload()
+        await bot.close()
+
+
+async def test_supervisor_resets_backoff_after_healthy_run():
+    from src.launcher import Supervisor
+
+    supervisor = Supervisor([[0]], 1, stagger=1.0, healthy_after=60.0)
+    process = MagicMock()
+    supervisor.processes[0] = process
+    supervisor.started_at[0] = 0.0
+    supervisor.restarts[0] = 5
+
+    process.is_alive.return_value = True
+    supervisor.check_workers(30.0)
+    assert supervisor.restarts[0] == 5
+    supervisor.check_workers(60.0)
+    assert 0 not in supervisor.restarts
+
+    process.is_alive.return_value = False
+    supervisor.check_workers(100.0)
+    assert supervisor.pending[0] == 101.0
+
+
+async def test_adventure_stream_failure_finishes_the_visible_message(bot):
+    from cogs.games import Games, FALLBACK_CHOICES, FALLBACK_OUTCOMES
+
+    bot.api_client = MagicMock(close=AsyncMock())
+    cog = Games(bot)
+
+    async def broken_stream(streamer, messages, max_tokens):
+        await streamer.feed("You wake in a")
+        raise RuntimeError("connection reset")
+
+    cog._stream_completion = broken_stream
+    message = MagicMock()
+    message.edit = AsyncMock()
+    ctx = MagicMock()
+    ctx.send = AsyncMock(return_value=message)
+    ctx.guild = None
+    bot.reactions = MagicMock()
+    bot.events = MagicMock()
+    bot.events.wait_for_reaction = AsyncMock(return_value=MagicMock(emoji="2️⃣", user_id=ctx.author.id))
+
+    assert await cog._adventure_openai(ctx)
+    embed = message.edit.await_args.kwargs["embed"]
+    assert [field.value for field in embed.fields] == FALLBACK_CHOICES
+    assert ctx.send.await_args.args == (FALLBACK_OUTCOMES[1],)
+    await bot.close()
+
+
+async def test_extension_module_runs_once_and_is_timed(bot, tmp_path, monkeypatch):
+    (tmp_path / "timed_ext.py").write_text(
+        "import os\n"
+        "os.environ['TIMED_EXT_RUNS'] = str(int(os.environ.get('TIMED_EXT_RUNS', 0)) + 1)\n"
+        "async def setup(bot):\n"
+        "    pass\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delenv("TIMED_EXT_RUNS", raising=False)
+
+    await bot._load_extension_timed("timed_ext")
+    assert os.environ["TIMED_EXT_RUNS"] == "1"
+    assert set(bot.startup_timings["timed_ext"]) == {"import", "setup"}
+    assert type(sys.modules["timed_ext"].__loader__).__name__ != "_TimedLoader"
+    await bot.unload_extension("timed_ext")
+    await bot.close()
@@ -0,0 +1,60 @@
+import pytest
+import asyncio
+from unittest.mock import MagicMock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.utils.events import EventRouter
+
+
+def fake_message(channel_id, content="hi"):
+    message = MagicMock()
+    message.channel.id = channel_id
+    message.content = content
+    return message
+
+
+@pytest.mark.asyncio
+async def test_message_waiter_only_sees_its_channel():
+    router = EventRouter()
+    checked = []
+
+    def check(message):
+        checked.append(message)
+        return message.content == "42"
+
+    waiter = asyncio.create_task(router.wait_for_message(1, check=check, timeout=1))
+    await asyncio.sleep(0)
+
+    router.dispatch("message", fake_message(2, "42"))
+    router.dispatch("message", fake_message(1, "nope"))
+    answer = fake_message(1, "42")
+    router.dispatch("message", answer)
+
+    assert await waiter is answer
+    assert len(checked) == 2
+    assert router.waiting() == 0
+
+
+@pytest.mark.asyncio
+async def test_reaction_waiter_returns_raw_payload():
+    router = EventRouter()
+    waiter = asyncio.create_task(router.wait_for_reaction(99, timeout=1))
+    await asyncio.sleep(0)
+
+    payload = MagicMock()
+    payload.message_id = 99
+    router.dispatch("raw_reaction_add", payload)
+
+    assert await waiter is payload
+
+
+@pytest.mark.asyncio
+async def test_waiter_times_out_and_is_removed():
+    router = EventRouter()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await router.wait_for_message(1, timeout=0.01)
+    assert router.waiting() == 0
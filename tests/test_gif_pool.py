@@ -0,0 +1,93 @@
+import pytest
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.utils.gif_pool import GifPool, normalize_query
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeGiphy:
+    def __init__(self, total=60, page_size=25):
+        self.total = total
+        self.page_size = page_size
+        self.calls = []
+
+    async def __call__(self, query, offset):
+        self.calls.append((query, offset))
+        urls = [f"{query}/{i}.gif" for i in range(offset, min(offset + self.page_size, self.total))]
+        return urls, self.total
+
+
+def test_normalize_query_folds_case_and_whitespace():
+    assert normalize_query("  Funny\tCATS ") == normalize_query("funny cats") == "funny cats"
+
+
+@pytest.mark.asyncio
+async def test_take_serves_from_pool_and_pages_when_dry():
+    giphy = FakeGiphy()
+    pool = GifPool(giphy)
+
+    urls = {await pool.take("Cats") for _ in range(25)}
+    assert len(urls) == 25
+    assert giphy.calls == [("cats", 0)]
+
+    await pool.take(" cats ")
+    assert giphy.calls == [("cats", 0), ("cats", 25)]
+
+
+@pytest.mark.asyncio
+async def test_pool_wraps_to_first_page_after_last():
+    giphy = FakeGiphy(total=30)
+    pool = GifPool(giphy)
+
+    for _ in range(31):
+        assert await pool.take("dogs") is not None
+    assert [offset for _, offset in giphy.calls] == [0, 25, 0]
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_and_lru_queries_are_evicted():
+    clock = FakeClock()
+    giphy = FakeGiphy()
+    pool = GifPool(giphy, ttl=60, max_urls=40, clock=clock)
+
+    await pool.take("a")
+    await pool.take("b")
+    assert len(pool) == 1 and pool.size == 24
+
+    clock.now = 61
+    await pool.take("b")
+    assert giphy.calls[-1] == ("b", 0)
+
+
+@pytest.mark.asyncio
+async def test_query_evicted_while_its_fetch_completes():
+    pool = GifPool(FakeGiphy(), max_urls=30)
+
+    cats, dogs = await asyncio.gather(pool.take("cats"), pool.take("dogs"))
+    assert cats.startswith("cats/") and dogs.startswith("dogs/")
+    assert len(pool) == 1 and pool.size == 24
+
+
+@pytest.mark.asyncio
+async def test_no_results_and_failures_are_distinguished():
+    pool = GifPool(FakeGiphy(total=0))
+    assert await pool.take("nothing") is None
+    assert pool.no_results("Nothing")
+
+    async def failing(query, offset):
+        return None
+
+    pool = GifPool(failing)
+    assert await pool.take("anything") is None
+    assert not pool.no_results("anything")
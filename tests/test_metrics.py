@@ -0,0 +1,75 @@
+import pytest
+import asyncio
+import aiohttp
+import discord
+from unittest.mock import MagicMock
+from discord.ext import commands
+from discord.ext.commands.view import StringView
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.utils.metrics import COMMAND_DURATION, Counter, Gauge, Histogram, MetricsServer, Registry
+
+
+def test_render_exposition_format():
+    registry = Registry()
+    requests = Counter("requests_total", "Requests.", ("host",), registry=registry)
+    latency = Histogram("latency_seconds", "Latency.", ("host",), buckets=(0.1, 1.0), registry=registry)
+    games = Gauge("games", "Games.", registry=registry)
+
+    requests.inc(host='a"b')
+    requests.inc(2, host="c")
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, host="c")
+    games.set_function(lambda: 4)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{host="a\\"b"} 1.0' in lines
+    assert 'requests_total{host="c"} 2.0' in lines
+    assert 'latency_seconds_bucket{host="c",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{host="c",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{host="c",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{host="c"} 3.65' in lines
+    assert 'latency_seconds_count{host="c"} 4' in lines
+    assert "games 4.0" in lines
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(unused_tcp_port):
+    registry = Registry()
+    Counter("hits_total", "Hits.", registry=registry).inc()
+    server = MetricsServer("127.0.0.1", unused_tcp_port, registry=registry)
+    await server.start()
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"http://127.0.0.1:{unused_tcp_port}/metrics") as response:
+                assert response.status == 200
+                assert "hits_total 1.0" in await response.text()
+    finally:
+        await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_commands_are_timed_without_hiding_errors():
+    from cogs.metrics import Metrics
+
+    bot = commands.Bot(command_prefix="!", intents=discord.Intents.none())
+    bot.loop = asyncio.get_running_loop()
+    bot.sessions = []
+
+    @bot.command(name="metrics_boom")
+    async def boom(ctx):
+        raise RuntimeError("boom")
+
+    await bot.add_cog(Metrics(bot))
+    try:
+        assert "on_command_error" not in bot.extra_events
+        ctx = commands.Context(message=MagicMock(), bot=bot, view=StringView(""), prefix="!", command=boom)
+        await bot.invoke(ctx)
+        assert COMMAND_DURATION.count(command="metrics_boom", outcome="error") == 1
+    finally:
+        await bot.remove_cog("Metrics")
+    assert bot._before_invoke is None and bot._after_invoke is None
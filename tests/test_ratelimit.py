@@ -0,0 +1,77 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.utils.ratelimit import TokenBucket, CircuitBreaker, RateLimits, parse_retry_after, backoff_delay
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_spaces_requests():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=2, clock=clock)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.5)
+
+    clock.now = 10
+    assert bucket.reserve() == 0
+
+
+def test_token_bucket_pause_delays_next_request():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=10, clock=clock)
+    bucket.pause(3)
+    assert bucket.reserve() == pytest.approx(3)
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+    assert not breaker.is_available()
+
+    clock.now = 31
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.allow()
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("garbage") is None
+
+
+def test_backoff_delay_honours_retry_after():
+    assert backoff_delay(3, 0.5, 8, retry_after=1.5) == 1.5
+    assert 0 <= backoff_delay(10, 0.5, 8) <= 8
+
+
+def test_rate_limits_merge_host_overrides():
+    limits = RateLimits({"default": {"rate": 3}, "hosts": {"opentdb.com": {"burst": 1}}})
+
+    limiter = limits.for_host("opentdb.com")
+    assert limiter.bucket.rate == 3
+    assert limiter.bucket.capacity == 1
+    assert limits.for_host("opentdb.com") is limiter
+
+
+def test_shipped_config_is_valid():
+    limits = RateLimits.from_file()
+    assert limits.for_host("opentdb.com").bucket.rate == pytest.approx(0.2)
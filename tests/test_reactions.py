@@ -0,0 +1,53 @@
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.utils.reactions import ReactionDispatcher
+
+
+def fake_message(message_id=1, channel_id=10):
+    message = MagicMock()
+    message.id = message_id
+    message.channel.id = channel_id
+    message.add_reaction = AsyncMock()
+    return message
+
+
+@pytest.mark.asyncio
+async def test_add_returns_immediately_and_adds_in_order():
+    dispatcher = ReactionDispatcher(interval=0)
+    message = fake_message()
+
+    task = dispatcher.add(message, ["1️⃣", "2️⃣", "3️⃣"])
+    message.add_reaction.assert_not_awaited()
+
+    await task
+    assert [c.args[0] for c in message.add_reaction.await_args_list] == ["1️⃣", "2️⃣", "3️⃣"]
+    assert dispatcher.pending() == 0
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_pending_reactions():
+    dispatcher = ReactionDispatcher(interval=0.05)
+    message = fake_message()
+
+    task = dispatcher.add(message, ["a", "b", "c", "d"])
+    await asyncio.sleep(0.01)
+    dispatcher.cancel(message)
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert message.add_reaction.await_count == 1
+
+
+def test_reserve_spaces_slots_per_channel():
+    now = [0.0]
+    dispatcher = ReactionDispatcher(interval=0.25, clock=lambda: now[0])
+
+    assert dispatcher._reserve(1) == 0
+    assert dispatcher._reserve(1) == pytest.approx(0.25)
+    assert dispatcher._reserve(2) == 0
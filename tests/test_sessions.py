@@ -0,0 +1,100 @@
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.utils.sessions import GameSession, SessionEngine
+
+
+class GuessSession(GameSession):
+    __slots__ = ("answer",)
+
+    timeout = 0.05
+
+    def __init__(self, channel_id, send, answer):
+        super().__init__(channel_id, send)
+        self.answer = answer
+
+    def accepts(self, message):
+        return message.content.isdigit()
+
+    async def on_message(self, message):
+        if message.content == self.answer:
+            await self.send("correct")
+            return True
+        self.touch()
+        return False
+
+    async def on_timeout(self):
+        await self.send("timeout")
+
+
+def fake_message(content, channel_id=1):
+    message = MagicMock()
+    message.content = content
+    message.channel.id = channel_id
+    return message
+
+
+@pytest.mark.asyncio
+async def test_answers_are_routed_and_finish_the_game():
+    engine = SessionEngine()
+    send = AsyncMock()
+    session = GuessSession(1, send, "7")
+
+    assert engine.start(session)
+    assert not engine.start(GuessSession(1, send, "8"))
+
+    engine.dispatch(fake_message("hello"))
+    engine.dispatch(fake_message("7", channel_id=2))
+    engine.dispatch(fake_message("3"))
+    engine.dispatch(fake_message("7"))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    send.assert_awaited_once_with("correct")
+    assert len(engine) == 0 and not session.active
+    engine.close()
+
+
+@pytest.mark.asyncio
+async def test_accepts_errors_never_reach_dispatch():
+    class BrokenSession(GuessSession):
+        def accepts(self, message):
+            return int(message.content) > 0
+
+    engine = SessionEngine()
+    send = AsyncMock()
+    engine.start(BrokenSession(1, send, "7"))
+
+    engine.dispatch(fake_message("²"))
+    await asyncio.sleep(0)
+
+    send.assert_not_awaited()
+    assert len(engine) == 1
+    engine.close()
+
+
+def test_trivia_ignores_non_decimal_digits():
+    from cogs.trivia import TriviaSession
+
+    session = TriviaSession(1, AsyncMock(), None, None, ["a", "b"], "a")
+    assert not session.accepts(fake_message("²"))
+    assert session.accepts(fake_message("2"))
+
+
+@pytest.mark.asyncio
+async def test_many_games_time_out_from_one_timer_task():
+    engine = SessionEngine()
+    send = AsyncMock()
+    for channel_id in range(100):
+        engine.start(GuessSession(channel_id, send, "1"))
+    assert len(engine) == 100
+
+    await asyncio.sleep(0.1)
+    assert send.await_count == 100
+    assert len(engine) == 0
+    engine.close()
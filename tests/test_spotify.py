@@ -0,0 +1,83 @@
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.utils.spotify import SpotifyClient
+
+
+def track_item(name):
+    return {
+        "name": name,
+        "artists": [{"name": "Artist"}],
+        "external_urls": {"spotify": f"https://open.spotify.com/track/{name}"},
+        "album": {"images": []}
+    }
+
+
+@pytest.fixture
+def api_client():
+    client = MagicMock()
+
+    async def post(url, data=None, headers=None):
+        await asyncio.sleep(0)
+        return {"access_token": "token", "expires_in": 3600}
+
+    client.post = AsyncMock(side_effect=post)
+    client.get = AsyncMock(return_value={"tracks": {"items": [track_item("a"), track_item("b")]}})
+    return client
+
+
+@pytest.mark.asyncio
+async def test_token_is_fetched_once_under_concurrency(api_client):
+    spotify = SpotifyClient(api_client, auth="auth")
+
+    tokens = await asyncio.gather(*(spotify.access_token() for _ in range(10)))
+
+    assert set(tokens) == {"token"}
+    api_client.post.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_token_is_refreshed_before_expiry(api_client):
+    now = [0.0]
+    spotify = SpotifyClient(api_client, auth="auth", refresh_margin=60, clock=lambda: now[0])
+
+    await spotify.access_token()
+    now[0] = 3500
+    await spotify.access_token()
+    assert api_client.post.await_count == 1
+
+    now[0] = 3541
+    await spotify.access_token()
+    assert api_client.post.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_recommend_reuses_genre_track_pool(api_client):
+    spotify = SpotifyClient(api_client, auth="auth")
+
+    for _ in range(5):
+        track = await spotify.recommend("rock")
+        assert track.title in ("a", "b")
+
+    api_client.get.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_genre_track_pools_are_bounded_and_expire(api_client):
+    now = [0.0]
+    spotify = SpotifyClient(api_client, auth="auth", pool_ttl=60, max_pools=2, clock=lambda: now[0])
+
+    await spotify.recommend("rock")
+    await spotify.recommend("jazz")
+    await spotify.recommend("rock")
+    await spotify.recommend("pop")
+    assert list(spotify._track_pools) == ["rock", "pop"]
+
+    now[0] = 61
+    await spotify.recommend("metal")
+    assert list(spotify._track_pools) == ["metal"]
@@ -0,0 +1,52 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.utils.state import MemoryStateBackend, SQLiteStateBackend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        backend = MemoryStateBackend()
+    else:
+        backend = SQLiteStateBackend(tmp_path / "state.db")
+    yield backend
+    backend.close()
+
+
+@pytest.mark.asyncio
+async def test_add_only_succeeds_once(backend):
+    assert await backend.add("trivia:1", True)
+    assert not await backend.add("trivia:1", True)
+
+    await backend.delete("trivia:1")
+    assert await backend.add("trivia:1", True)
+
+
+@pytest.mark.asyncio
+async def test_expired_keys_can_be_added_again(backend):
+    assert await backend.add("wordgame:1", True, ttl=-1)
+    assert await backend.get("wordgame:1") is None
+    assert await backend.add("wordgame:1", True, ttl=60)
+
+
+@pytest.mark.asyncio
+async def test_values_round_trip(backend):
+    await backend.set("cache", {"a": [1, 2]})
+    assert await backend.get("cache") == {"a": [1, 2]}
+    assert await backend.get("missing", "default") == "default"
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_is_shared_between_connections(tmp_path):
+    first = SQLiteStateBackend(tmp_path / "state.db")
+    second = SQLiteStateBackend(tmp_path / "state.db")
+
+    assert await first.add("trivia:1", True)
+    assert not await second.add("trivia:1", True)
+
+    first.close()
+    second.close()
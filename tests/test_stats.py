@@ -0,0 +1,51 @@
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.utils.stats import StatsStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return StatsStore(tmp_path / "stats.db", top_n=2)
+
+
+@pytest.mark.asyncio
+async def test_updates_are_batched_into_one_flush(store):
+    for _ in range(50):
+        store.increment(1, 100, "trivia_correct")
+    store.increment(1, 200, "trivia_correct", 3)
+    store.record_max(1, 100, "wordgame_longest_chain", 4)
+    store.record_max(1, 100, "wordgame_longest_chain", 2)
+
+    assert await store.user_stats(1, 100) == {"trivia_correct": 50, "wordgame_longest_chain": 4}
+
+    with patch.object(store, "_write", wraps=store._write) as write:
+        await store.flush()
+        await store.flush()
+    write.assert_called_once()
+
+    store.record_max(1, 100, "wordgame_longest_chain", 3)
+    store.increment(1, 100, "trivia_correct")
+    await store.flush()
+    assert await store.user_stats(1, 100) == {"trivia_correct": 51, "wordgame_longest_chain": 4}
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_is_served_from_precomputed_top(store):
+    store.increment(1, 100, "trivia_correct", 5)
+    store.increment(1, 200, "trivia_correct", 9)
+    store.increment(1, 300, "trivia_correct", 1)
+    store.increment(2, 400, "trivia_correct", 7)
+    await store.flush()
+
+    with patch.object(store, "_execute") as execute:
+        assert await store.leaderboard(1, "trivia_correct") == [(200, 9), (100, 5)]
+    execute.assert_not_called()
+
+    assert await store.leaderboard(1, "adventures_completed") == []
+    await store.close()
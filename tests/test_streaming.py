@@ -0,0 +1,53 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.utils.streaming import StreamingMessage, render_text
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def chunks(clock, items, step):
+    for item in items:
+        clock.now += step
+        yield item
+
+
+@pytest.mark.asyncio
+async def test_edits_are_throttled_and_finish_makes_final_edit():
+    clock = FakeClock()
+    message = MagicMock()
+    message.edit = AsyncMock()
+    send = AsyncMock(return_value=message)
+    streamer = StreamingMessage(send, lambda text: {"content": text}, min_interval=1.0, clock=clock)
+
+    # Ten tokens over 2.5 seconds: one send, then at most one edit per second.
+    await streamer.consume(chunks(clock, [f"t{i} " for i in range(10)], 0.25))
+    send.assert_awaited_once_with(content="t0 ")
+    assert streamer.first_visible == 0.25
+    assert message.edit.await_count == 2
+
+    assert await streamer.finish() is message
+    assert message.edit.await_args.kwargs == {"content": streamer.text}
+    assert message.edit.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_finish_sends_when_nothing_streamed():
+    send = AsyncMock()
+    streamer = StreamingMessage(send, render_text, clock=FakeClock())
+
+    await streamer.consume(chunks(FakeClock(), ["", "  "], 0))
+    send.assert_not_awaited()
+
+    await streamer.finish()
+    send.assert_awaited_once_with(content="...")
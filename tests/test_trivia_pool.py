@@ -0,0 +1,70 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.utils.trivia_pool import TriviaPool, OPENTDB_URL
+
+
+def raw_question(i):
+    return {
+        "question": f"Question%20{i}",
+        "correct_answer": "Yes",
+        "incorrect_answers": ["No"],
+        "category": "General",
+        "difficulty": "easy"
+    }
+
+
+def fake_api_client(batches):
+    async def get(url, params=None, headers=None):
+        if url != OPENTDB_URL:
+            return {"response_code": 0, "token": "tok"}
+        amount = params["amount"]
+        start = batches.pop(0) if batches else 0
+        return {"response_code": 0, "results": [raw_question(start + i) for i in range(amount)]}
+
+    client = MagicMock()
+    client.get = AsyncMock(side_effect=get)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_take_fills_empty_pool_in_bulk(tmp_path):
+    api_client = fake_api_client([0, 50])
+    pool = TriviaPool(api_client, path=tmp_path / "pool.json", high_watermark=60, min_interval=0)
+
+    question = await pool.take()
+    assert question["question"] == "Question 0"
+    assert question["incorrect_answers"] == ["No"]
+
+    await pool.close()
+    quiz_calls = [c for c in api_client.get.await_args_list if c.args[0] == OPENTDB_URL]
+    assert [c.kwargs["params"]["amount"] for c in quiz_calls] == [50, 10]
+    assert all(c.kwargs["params"]["token"] == "tok" for c in quiz_calls)
+
+
+@pytest.mark.asyncio
+async def test_take_serves_from_memory_above_low_watermark(tmp_path):
+    api_client = fake_api_client([])
+    pool = TriviaPool(api_client, path=tmp_path / "pool.json", low_watermark=1)
+    pool._pool((None, None)).extend([{"question": "a"}, {"question": "b"}, {"question": "c"}])
+
+    assert (await pool.take())["question"] == "a"
+    api_client.get.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_pool_is_persisted_across_instances(tmp_path):
+    path = tmp_path / "pool.json"
+    pool = TriviaPool(fake_api_client([]), path=path)
+    pool._pool((9, "hard")).append({"question": "saved"})
+    pool._token = "tok"
+    pool.save()
+
+    restored = TriviaPool(fake_api_client([]), path=path)
+    restored.load()
+    assert restored.size(9, "hard") == 1
+    assert restored._token == "tok"
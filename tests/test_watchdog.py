@@ -0,0 +1,34 @@
+import pytest
+import time
+import asyncio
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.utils.watchdog import LOOP_STALLS, LoopWatchdog
+
+
+class FakeCog:
+    def blocking_command(self):
+        time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_reports_blocking_cog_callback():
+    watchdog = LoopWatchdog(interval=0.02, threshold=0.1)
+    watchdog.start()
+    try:
+        await asyncio.sleep(0.05)
+        with patch("src.utils.watchdog.COGS_DIR", os.path.dirname(os.path.abspath(__file__))), \
+                patch("logging.Logger.warning") as mock_warning:
+            FakeCog().blocking_command()
+            await asyncio.sleep(0.05)
+    finally:
+        watchdog.stop()
+
+    assert watchdog.stalls == 1
+    assert LOOP_STALLS.value(location="FakeCog.blocking_command") == 1
+    assert "FakeCog.blocking_command" in mock_warning.call_args.args[0]
+    assert watchdog.max_lag >= 0.2
@@ -0,0 +1,36 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.utils.wordlist import WordIndex, build_index
+
+
+@pytest.fixture
+def index(tmp_path):
+    source = tmp_path / "source.txt"
+    source.write_text("Apple\nbanana\nband\nBAND\ncafé\nx\nbee\nzebra\nyak's\nantelope\n")
+    assert build_index(source, tmp_path / "words.txt") == 6
+    index = WordIndex(tmp_path / "words.txt")
+    yield index
+    index.close()
+
+
+def test_membership(index):
+    for word in ("apple", "antelope", "band", "banana", "bee", "zebra"):
+        assert word in index
+    for word in ("ban", "bandana", "aardvark", "zzz", "x", "café", ""):
+        assert word not in index
+
+
+def test_random_word_by_letter(index):
+    assert index.random_word("b") in {"band", "banana", "bee"}
+    assert index.random_word("b", exclude={"band", "banana"}) == "bee"
+    assert index.random_word("b", exclude={"band", "banana", "bee"}) is None
+    assert index.random_word("z") == "zebra"
+    assert index.random_word("q") is None
+
+
+def test_load_missing_file(tmp_path):
+    assert WordIndex.load(tmp_path / "missing.txt") is None